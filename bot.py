@@ -3,9 +3,18 @@ import asyncio
 
 from aiogram import Bot, Dispatcher
 
-from settings import TOKEN, logger
+from settings import TOKEN, EDITOR_CACHE_SWEEP_SECONDS, logger
 from handlers import routers  # берем список роутеров
 from db import init_db, close_db  # инициализация и закрытие PostgreSQL
+from pdf_services import evict_idle_documents
+
+
+async def sweep_editor_documents():
+    """Фоном закрывает документы редактора страниц, которые давно не трогали."""
+    while True:
+        await asyncio.sleep(EDITOR_CACHE_SWEEP_SECONDS)
+        evict_idle_documents()
+
 
 async def main():
     if not TOKEN:
@@ -24,10 +33,12 @@ async def main():
 
     logger.info("Bot started")
 
+    sweeper = asyncio.create_task(sweep_editor_documents())
     try:
         # 2) Стартуем polling
         await dp.start_polling(bot)
     finally:
+        sweeper.cancel()
         # 3) Корректно закрываем пул подключений к БД
         await close_db()
 
@@ -7,6 +7,7 @@ from .text_handlers import router as text_router
 from .pages import router as pages_router
 from .watermark import router as watermark_router
 from .merge import router as merge_router
+from .split import router as split_router
 from .pro import router as pro_router
 from .legal import router as legal_router
 from .support import router as support_router
@@ -23,5 +24,6 @@ routers = [
     pages_router,
     watermark_router,
     merge_router,
+    split_router,
     text_router,       
 ]
\ No newline at end of file
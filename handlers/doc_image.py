@@ -12,10 +12,13 @@ from settings import (
 )
 
 from i18n import t  # ЛОКАЛИЗАЦИЯ
+from state import user_modes
 from pdf_services import (
     image_file_to_pdf,
     office_doc_to_pdf,
 )
+from services.converters.pdf.convert import IMAGE_EXTS, OFFICE_EXTS
+from handlers.merge import add_merge_file
 
 router = Router()
 
@@ -63,6 +66,20 @@ async def handle_doc(message: types.Message, bot: Bot):
     if not await check_size_or_reject(message, doc_msg.file_size):
         return
 
+    # =============== MERGE: картинки и документы вперемешку с PDF ===============
+    if user_modes.get(user_id) == "merge":
+        if f".{ext}" not in IMAGE_EXTS | OFFICE_EXTS:
+            await message.answer(t(user_id, "err_unsupported"))
+            return
+
+        file = await bot.get_file(doc_msg.file_id)
+        src_path = FILES_DIR / filename
+        await bot.download_file(file.file_path, destination=src_path)
+
+        # конвертация в PDF идёт в фоне, пока присылают следующие файлы
+        await add_merge_file(message, src_path)
+        return
+
     # =============== IMAGE AS FILE ===============
     if doc_msg.mime_type and doc_msg.mime_type.startswith("image/"):
         await message.answer(t(user_id, "msg_converting_image"))
@@ -1,35 +1,253 @@
 # handlers/merge.py
+import asyncio
+import shutil
 from pathlib import Path
 
 from aiogram import Router, types, F
-from PyPDF2 import PdfMerger
 
-from settings import FILES_DIR, logger
-from state import user_modes, user_merge_files
+from settings import FILES_DIR, MERGE_DIR, get_merge_limit, logger
+from state import user_modes, user_merge_sessions
+from keyboards import get_merge_keyboard
+from pdf_services import (
+    convert_to_pdf,
+    create_merge_session,
+    append_to_merge_session,
+    reorder_merge_session,
+    finish_merge_session,
+    discard_merge_session,
+)
 from i18n import t
 
 router = Router()
 
-async def _run_merge(user_id: int, message: types.Message) -> None:
-    files_list = user_merge_files.get(user_id, [])
+# Текстовые команды режима объединения (на обоих языках)
+MERGE_LIST_WORDS = {"список", "list"}
+MERGE_REMOVE_WORDS = {"удалить", "remove"}
+MERGE_ORDER_WORDS = {"порядок", "order"}
 
-    if len(files_list) < 2:
+
+def _get_session(user_id: int) -> dict:
+    """
+    Сессия объединения пользователя (создаётся при первом файле).
+    К полям create_merge_session добавляются:
+      queued — сколько файлов принято (включая ещё не дописанные),
+      received — сколько файлов пришло за сессию (для имён файлов в её папке),
+      tail   — последняя операция в очереди сессии,
+      closed — сессия сброшена, оставшиеся операции не выполняются.
+    """
+    session = user_merge_sessions.get(user_id)
+    if session is None:
+        session = create_merge_session(MERGE_DIR)
+        session.update(queued=0, received=0, tail=None, closed=False)
+        user_merge_sessions[user_id] = session
+    return session
+
+
+def _chain(session: dict, step) -> asyncio.Task:
+    """
+    Ставит операцию в очередь сессии: файлы дописываются строго в порядке
+    получения, команды выполняются после уже принятых файлов.
+    step — функция без аргументов, возвращающая корутину.
+    """
+    prev = session["tail"]
+
+    async def run():
+        if prev is not None:
+            await asyncio.wait([prev])
+        if session["closed"]:
+            return None
+        return await step()
+
+    task = asyncio.create_task(run())
+    session["tail"] = task
+    return task
+
+
+async def _settled(session: dict) -> None:
+    """Ждёт, пока выполнятся все операции, уже стоящие в очереди сессии."""
+    if session["tail"] is not None:
+        await asyncio.wait([session["tail"]])
+
+
+async def _append(
+    message: types.Message,
+    session: dict,
+    src_path: Path,
+    name: str,
+    converting: asyncio.Task | None,
+) -> None:
+    """Добавляет файл в сессию (после фоновой конвертации, если она была)."""
+    user_id = message.from_user.id
+
+    pdf_path = src_path if converting is None else await converting
+    if converting is not None:
+        src_path.unlink(missing_ok=True)
+    if pdf_path is None:
+        logger.error(f"Merge convert error for user {user_id}: {name}")
+        await message.answer(t(user_id, "merge_convert_error", name=name))
+        session["queued"] -= 1
+        return
+
+    entry = await asyncio.to_thread(append_to_merge_session, session, pdf_path, name)
+    if entry is None:
+        await message.answer(t(user_id, "merge_append_error", name=name))
+        session["queued"] -= 1
+
+
+async def add_merge_file(message: types.Message, src_path: Path) -> None:
+    """
+    Добавляет файл в сессию объединения.
+    Файл сразу переносится в папку сессии под своим номером — до сборки
+    его не затрёт следующая загрузка или конвертация с тем же именем.
+    Не-PDF уходит в конвертацию в фоне (параллельно с другими),
+    затем файлы по очереди дописываются в итог сессии.
+    """
+    user_id = message.from_user.id
+    session = _get_session(user_id)
+
+    session["received"] += 1
+    name = src_path.name
+    stored_path = session["dir"] / f"{session['received']:04d}_{name}"
+    shutil.move(src_path, stored_path)
+
+    limit = await get_merge_limit(user_id)
+    if session["queued"] >= limit:
+        stored_path.unlink(missing_ok=True)
+        await message.answer(t(user_id, "merge_too_many", limit=limit))
+        return
+
+    session["queued"] += 1
+    count = session["queued"]
+
+    converting = None
+    if stored_path.suffix.lower() != ".pdf":
+        converting = asyncio.create_task(
+            asyncio.to_thread(convert_to_pdf, stored_path, stored_path.with_suffix(".pdf"))
+        )
+    _chain(session, lambda: _append(message, session, stored_path, name, converting))
+
+    # показываем кнопку "Объединить", когда файлов >= 2
+    if count >= 2:
+        kb = get_merge_keyboard(user_id)
+    else:
+        kb = None
+
+    await message.answer(
+        t(
+            user_id,
+            "merge_file_added",
+            count=count,
+        ),
+        reply_markup=kb,
+    )
+
+
+def drop_merge_session(user_id: int) -> None:
+    """Сбрасывает сессию объединения; файлы удаляются после текущей операции."""
+    session = user_merge_sessions.pop(user_id, None)
+    if session is None:
+        return
+
+    session["closed"] = True
+    tail = session["tail"]
+    if tail is None or tail.done():
+        discard_merge_session(session)
+    else:
+        tail.add_done_callback(lambda _: discard_merge_session(session))
+
+
+def _files_list_text(user_id: int, session: dict) -> str:
+    if not session["files"]:
+        return t(user_id, "merge_list_empty")
+
+    lines = [t(user_id, "merge_list_header", count=len(session["files"]))]
+    for index, entry in enumerate(session["files"], start=1):
+        lines.append(
+            t(user_id, "merge_list_item", index=index, name=entry["name"], pages=entry["pages"])
+        )
+    return "\n".join(lines)
+
+
+def _parse_numbers(words: list[str]) -> list[int] | None:
+    try:
+        return [int(w) for w in words]
+    except ValueError:
+        return None
+
+
+async def handle_merge_command(message: types.Message, text_val: str) -> bool:
+    """
+    Команды режима объединения:
+      «список» / list            — файлы сессии с числом страниц,
+      «удалить 2 5» / remove 2 5 — убрать файлы из объединения,
+      «порядок 3 1 2» / order …  — новый порядок всех файлов.
+    Возвращает True, если сообщение было командой.
+    """
+    user_id = message.from_user.id
+    words = text_val.replace(",", " ").split()
+    if not words or words[0] not in MERGE_LIST_WORDS | MERGE_REMOVE_WORDS | MERGE_ORDER_WORDS:
+        return False
+
+    session = user_merge_sessions.get(user_id)
+    if session is None:
+        await message.answer(t(user_id, "merge_list_empty"))
+        return True
+
+    command = words[0]
+    numbers = _parse_numbers(words[1:])
+
+    async def run() -> str | None:
+        total = len(session["files"])
+        if command in MERGE_LIST_WORDS:
+            return _files_list_text(user_id, session)
+
+        if command in MERGE_REMOVE_WORDS:
+            if not numbers or any(n < 1 or n > total for n in numbers):
+                return t(user_id, "merge_bad_index")
+            order = [i for i in range(total) if i + 1 not in numbers]
+        else:
+            if not numbers or sorted(numbers) != list(range(1, total + 1)):
+                return t(user_id, "merge_bad_order")
+            order = [n - 1 for n in numbers]
+
+        reorder_merge_session(session, order)
+        session["queued"] -= total - len(order)
+        return _files_list_text(user_id, session)
+
+    reply = await _chain(session, run)
+    if reply:
+        await message.answer(reply)
+    return True
+
+
+async def run_merge(user_id: int, message: types.Message) -> None:
+    """
+    Собирает итог сессии объединения: ждёт очередь (конвертации и дописывание
+    файлов в итог), затем только записывает уже собранный итог.
+    """
+    session = user_merge_sessions.get(user_id)
+
+    if session is None or session["queued"] < 2:
         await message.answer(t(user_id, "merge_need_two"))
         return
 
-    await message.answer(t(user_id, "merge_start", count=len(files_list)))
+    # новые файлы с этого момента пойдут уже в новую сессию
+    user_merge_sessions.pop(user_id, None)
+    await message.answer(t(user_id, "merge_start", count=session["queued"]))
+    await _settled(session)
+
+    if len(session["files"]) < 2:
+        # часть файлов не сконвертировалась — возвращаем сессию, если новой ещё нет
+        if user_merge_sessions.setdefault(user_id, session) is not session:
+            discard_merge_session(session)
+        await message.answer(t(user_id, "merge_need_two"))
+        return
 
-    merged_name = Path(files_list[0]).stem + "_merged.pdf"
+    merged_name = Path(session["files"][0]["name"]).stem + "_merged.pdf"
     merged_path = FILES_DIR / merged_name
 
-    try:
-        merger = PdfMerger()
-        for p in files_list:
-            merger.append(str(p))
-        merger.write(str(merged_path))
-        merger.close()
-    except Exception as e:
-        logger.error(f"Merge error for user {user_id}: {e}")
+    if await asyncio.to_thread(finish_merge_session, session, merged_path) is None:
+        logger.error(f"Merge error for user {user_id}")
         await message.answer(t(user_id, "merge_error"))
         return
 
@@ -38,8 +256,6 @@ async def _run_merge(user_id: int, message: types.Message) -> None:
         caption=t(user_id, "msg_done"),
     )
 
-    user_merge_files[user_id] = []
-
 
 @router.callback_query(F.data == "merge:confirm")
 async def merge_confirm(callback: types.CallbackQuery):
@@ -51,4 +267,4 @@ async def merge_confirm(callback: types.CallbackQuery):
         return
 
     await callback.answer()
-    await _run_merge(user_id, callback.message)
+    await run_merge(user_id, callback.message)
@@ -3,11 +3,13 @@ from aiogram import Router, types, F
 
 from state import (
     user_modes,
-    user_merge_files,
     user_watermark_state,
-    user_pages_state,
+    user_blank_pages_state,
+    user_split_state,
 )
 from keyboards import get_main_keyboard
+from handlers.merge import drop_merge_session
+from handlers.pages import drop_pages_session
 from settings import is_pro
 from i18n import t, TEXTS
 
@@ -54,9 +56,11 @@ WATERMARK_TEXTS = {
 
 def reset_user_state(user_id: int):
     user_modes[user_id] = "compress"
-    user_merge_files[user_id] = []
+    drop_merge_session(user_id)
     user_watermark_state[user_id] = {}
-    user_pages_state[user_id] = {}
+    drop_pages_session(user_id)
+    user_blank_pages_state[user_id] = {}
+    user_split_state[user_id] = {}
 
 
 @router.message(F.text.in_(COMPRESS_TEXTS))
@@ -2,16 +2,69 @@
 from pathlib import Path
 
 from aiogram import Router, types, F
-from PyPDF2 import PdfReader, PdfWriter
 
 from settings import FILES_DIR, logger, is_pro
 from state import user_modes, user_pages_state
 from keyboards import get_pages_menu_keyboard, get_rotate_keyboard
-from pdf_services import rotate_page_inplace
+from pdf_services import (
+    journal_page_count,
+    journal_rotate,
+    apply_journal,
+    render_journal_preview,
+    drop_document,
+)
+from services.converters.pdf.page_journal import PREVIEW_MAX_PAGES
 from i18n import t
 
 router = Router()
 
+# Кнопки поворота (get_rotate_keyboard): данные кнопки -> угол по часовой стрелке
+ROTATE_ANGLES = {"+90": 90, "-90": -90, "180": 180}
+
+
+def pages_menu_keyboard(user_id: int, state: dict) -> types.InlineKeyboardMarkup:
+    """Меню редактора с учётом переключателя превью после каждого шага."""
+    return get_pages_menu_keyboard(user_id, step_preview=state.get("step_preview", False))
+
+
+def drop_pages_session(user_id: int) -> None:
+    """Сбрасывает сессию редактора страниц и закрывает её документ в кэше."""
+    pdf_path = (user_pages_state.get(user_id) or {}).get("pdf_path")
+    if pdf_path:
+        drop_document(Path(pdf_path))
+    user_pages_state[user_id] = {}
+
+
+async def send_pages_preview(message: types.Message, user_id: int, state: dict) -> None:
+    """Превью документа с учётом журнала правок (без сборки PDF)."""
+    journal = state["journal"]
+    png = render_journal_preview(Path(state["pdf_path"]), journal)
+    if png is None:
+        await message.answer(t(user_id, "pages_preview_failed"))
+        return
+
+    num_pages = journal_page_count(journal)
+    if num_pages > PREVIEW_MAX_PAGES:
+        caption = t(user_id, "pages_preview_caption_more", shown=PREVIEW_MAX_PAGES, num_pages=num_pages)
+    else:
+        caption = t(user_id, "pages_preview_caption", num_pages=num_pages)
+
+    await message.answer_photo(
+        types.BufferedInputFile(png, filename="preview.png"),
+        caption=caption,
+    )
+
+
+async def after_pages_step(message: types.Message, user_id: int, state: dict, text_key: str) -> None:
+    """После правки: превью (если включено) и снова меню редактора."""
+    if state.get("step_preview"):
+        await send_pages_preview(message, user_id, state)
+
+    await message.answer(
+        t(user_id, text_key),
+        reply_markup=pages_menu_keyboard(user_id, state),
+    )
+
 
 @router.callback_query(F.data == "pages_action:rotate")
 async def pages_rotate_action(callback: types.CallbackQuery):
@@ -92,10 +145,32 @@ async def pages_extract_action(callback: types.CallbackQuery):
     await callback.answer()
 
 
+@router.callback_query(F.data == "pages_action:reorder")
+async def pages_reorder_action(callback: types.CallbackQuery):
+    user_id = callback.from_user.id
+    state = user_pages_state.get(user_id) or {}
+    pdf_path = state.get("pdf_path")
+    num_pages = state.get("pages")
+
+    if not await is_pro(user_id):
+        await callback.answer(t(user_id, "pages_pro_only"), show_alert=True)
+        return
+
+    if not pdf_path or not Path(pdf_path).exists() or not num_pages:
+        await callback.answer(t(user_id, "pages_no_pdf"), show_alert=True)
+        return
+
+    user_modes[user_id] = "pages_reorder_wait_order"
+    await callback.message.answer(
+        t(user_id, "pages_reorder_ask_order", num_pages=num_pages)
+    )
+    await callback.answer()
+
+
 @router.callback_query(F.data == "pages_action:cancel")
 async def pages_cancel_action(callback: types.CallbackQuery):
     user_id = callback.from_user.id
-    user_pages_state[user_id] = {}
+    drop_pages_session(user_id)
     user_modes[user_id] = "compress"
 
     await callback.message.answer(
@@ -109,9 +184,8 @@ async def pages_rotate_angle_callback(callback: types.CallbackQuery):
     user_id = callback.from_user.id
     data = callback.data.split(":", 1)[1]
 
-    try:
-        angle = int(data)
-    except ValueError:
+    angle = ROTATE_ANGLES.get(data)
+    if angle is None:
         await callback.answer(t(user_id, "pages_bad_angle"), show_alert=True)
         return
 
@@ -130,50 +204,81 @@ async def pages_rotate_angle_callback(callback: types.CallbackQuery):
 
     rotate_pages = state.get("rotate_pages") or list(range(1, num_pages + 1))
 
-    try:
-        reader = PdfReader(str(pdf_path))
-    except Exception as e:
-        logger.error(f"Pages rotate open error: {e}")
-        await callback.message.answer(t(user_id, "pages_open_error"))
-        await callback.answer()
+    # поворот только записывается в журнал, файл соберётся при сохранении
+    journal_rotate(state["journal"], rotate_pages, angle)
+    state.pop("rotate_pages", None)
+    user_pages_state[user_id] = state
+    user_modes[user_id] = "pages_menu"
+
+    await callback.message.answer(t(user_id, "pages_rotated_done", angle=angle))
+    await after_pages_step(callback.message, user_id, state, "pages_continue_choose_action")
+    await callback.answer()
+
+
+@router.callback_query(F.data == "pages_action:preview")
+async def pages_preview_action(callback: types.CallbackQuery):
+    user_id = callback.from_user.id
+    state = user_pages_state.get(user_id) or {}
+    pdf_path = state.get("pdf_path")
+
+    if not pdf_path or not Path(pdf_path).exists() or not state.get("journal"):
+        await callback.answer(t(user_id, "pages_no_pdf"), show_alert=True)
+        return
+
+    await callback.answer()
+    await send_pages_preview(callback.message, user_id, state)
+
+
+@router.callback_query(F.data == "pages_action:step_preview")
+async def pages_step_preview_action(callback: types.CallbackQuery):
+    user_id = callback.from_user.id
+    state = user_pages_state.get(user_id) or {}
+
+    if not state.get("journal"):
+        await callback.answer(t(user_id, "pages_no_pdf"), show_alert=True)
         return
 
-    writer = PdfWriter()
-    rotate_set = set(rotate_pages)
+    state["step_preview"] = not state.get("step_preview", False)
+    user_pages_state[user_id] = state
 
-    for idx, page in enumerate(reader.pages, start=1):
-        if idx in rotate_set:
-            rotate_page_inplace(page, angle)
-        writer.add_page(page)
+    await callback.message.edit_reply_markup(reply_markup=pages_menu_keyboard(user_id, state))
+    await callback.answer()
 
-    out_path = FILES_DIR / f"{Path(pdf_path).stem}_rotated.pdf"
 
-    try:
-        with open(out_path, "wb") as f:
-            writer.write(f)
-    except Exception as e:
-        logger.error(f"Pages rotate write error: {e}")
+@router.callback_query(F.data == "pages_action:export")
+async def pages_export_action(callback: types.CallbackQuery):
+    user_id = callback.from_user.id
+    state = user_pages_state.get(user_id) or {}
+    pdf_path = state.get("pdf_path")
+
+    if not await is_pro(user_id):
+        await callback.answer(t(user_id, "pages_pro_only"), show_alert=True)
+        return
+
+    if not pdf_path or not Path(pdf_path).exists() or not state.get("journal"):
+        await callback.answer(t(user_id, "pages_no_pdf"), show_alert=True)
+        return
+
+    await callback.answer()
+
+    # все накопленные правки — один проход по исходному файлу
+    journal = state["journal"]
+    out_path = apply_journal(
+        Path(pdf_path), journal, FILES_DIR / f"{Path(pdf_path).stem}_edited.pdf"
+    )
+    if not out_path:
+        logger.error(f"Pages export error for user {user_id}")
         await callback.message.answer(t(user_id, "pages_save_error"))
-        await callback.answer()
         return
 
     await callback.message.answer_document(
         types.FSInputFile(out_path),
-        caption=t(user_id, "pages_rotated_done", angle=angle),
+        caption=t(user_id, "pages_export_done", num_pages=journal_page_count(journal)),
     )
-
-    # Обновляем состояние
-    state["pdf_path"] = out_path
-    state["pages"] = num_pages
-    state.pop("rotate_pages", None)
-    user_pages_state[user_id] = state
-    user_modes[user_id] = "pages_menu"
-
     await callback.message.answer(
         t(user_id, "pages_continue_choose_action"),
-        reply_markup=get_pages_menu_keyboard(user_id),
+        reply_markup=pages_menu_keyboard(user_id, state),
     )
-    await callback.answer()
 
 
 @router.callback_query(F.data == "pages_back_to_menu")
@@ -192,7 +297,7 @@ async def pages_back_to_menu_callback(callback: types.CallbackQuery):
         user_modes[user_id] = "pages_menu"
         await callback.message.answer(
             t(user_id, "pages_menu_header", num_pages=num_pages),
-            reply_markup=get_pages_menu_keyboard(user_id),
+            reply_markup=pages_menu_keyboard(user_id, state),
         )
 
     await callback.answer()
@@ -1,9 +1,11 @@
 from pathlib import Path
-import zipfile
 
 from aiogram import Router, types, F, Bot
-from PyPDF2 import PdfReader, PdfWriter
-from keyboards import get_pages_menu_keyboard, get_merge_keyboard
+from keyboards import (
+    get_pages_menu_keyboard,
+    get_blank_pages_keyboard,
+    get_split_keyboard,
+)
 
 from settings import (
     get_user_limit,
@@ -14,18 +16,26 @@ from settings import (
 )
 from state import (
     user_modes,
-    user_merge_files,
     user_watermark_state,
     user_pages_state,
+    user_blank_pages_state,
+    user_split_state,
 )
 from pdf_services import (
-    ocr_pdf_to_txt,
+    ocr_pdf_to_txt_parts,
     create_searchable_pdf,
-    split_pdf_to_pages,
-    extract_text_from_pdf,
+    find_blank_pages,
+    remove_pages,
+    extract_structured_text,
     compress_pdf,
+    split_page_count,
+    new_journal,
+    count_pages,
 )
 from i18n import t
+from utils import send_documents
+from handlers.merge import add_merge_file
+from handlers.pages import drop_pages_session
 
 router = Router()
 
@@ -54,6 +64,58 @@ async def check_size_or_reject(message: types.Message, size_bytes: int | None) -
     return True
 
 
+async def offer_blank_pages_removal(
+    message: types.Message,
+    pdf_path: Path,
+    pages: list[int] | None = None,
+) -> None:
+    """
+    Если в PDF есть пустые страницы — предлагает удалить их кнопкой.
+    pages — уже найденные пустые страницы (например, при OCR);
+    None — страницы классифицируются заново.
+    """
+    user_id = message.from_user.id
+
+    if pages is None:
+        pages = find_blank_pages(pdf_path)
+    if not pages:
+        return
+
+    user_blank_pages_state[user_id] = {"pdf_path": pdf_path, "pages": pages}
+    await message.answer(
+        t(
+            user_id,
+            "blank_pages_found",
+            count=len(pages),
+            pages=", ".join(map(str, pages)),
+        ),
+        reply_markup=get_blank_pages_keyboard(user_id),
+    )
+
+
+@router.callback_query(F.data == "blank:remove")
+async def blank_remove(callback: types.CallbackQuery):
+    user_id = callback.from_user.id
+    state = user_blank_pages_state.get(user_id) or {}
+
+    await callback.answer()
+    if not state.get("pdf_path") or not state.get("pages"):
+        await callback.message.answer(t(user_id, "blank_no_data"))
+        return
+
+    out_path = remove_pages(state["pdf_path"], state["pages"])
+    if not out_path:
+        await callback.message.answer(t(user_id, "blank_remove_failed"))
+        return
+
+    await callback.message.answer_document(
+        types.FSInputFile(out_path),
+        caption=t(user_id, "blank_removed_done", count=len(state["pages"])),
+    )
+    user_blank_pages_state[user_id] = {}
+    logger.info(f"Blank pages removed for user {user_id}: {state['pages']}")
+
+
 @router.message(F.document & (F.document.mime_type == "application/pdf"))
 async def handle_pdf(message: types.Message, bot: Bot):
     user_id = message.from_user.id
@@ -77,17 +139,19 @@ async def handle_pdf(message: types.Message, bot: Bot):
             await message.answer(t(user_id, "pages_pro_only_full"))
             return
 
-        try:
-            reader = PdfReader(str(src_path))
-            num_pages = len(reader.pages)
-        except Exception as e:
-            logger.error(f"Pages editor open error: {e}")
+        # документ прошлой сессии больше не нужен; новый открывается один раз
+        # и остаётся в кэше сессии редактора
+        drop_pages_session(user_id)
+        num_pages = count_pages(src_path)
+        if num_pages is None:
             await message.answer(t(user_id, "err_open_pdf"))
             return
 
+        # правки копятся в журнале, исходный файл не переписывается до сохранения
         user_pages_state[user_id] = {
             "pdf_path": src_path,
             "pages": num_pages,
+            "journal": new_journal(num_pages),
         }
         user_modes[user_id] = "pages_menu"
 
@@ -112,7 +176,22 @@ async def handle_pdf(message: types.Message, bot: Bot):
 
         await message.answer(t(user_id, "msg_ocr_processing"))
 
-        txt_path = ocr_pdf_to_txt(src_path, user_id, lang="rus+eng")
+        # длинные документы отдаём кусками по мере распознавания,
+        # в конце — полный TXT
+        txt_path = None
+        blank_pages: list[int] = []
+        out_path = FILES_DIR / (src_path.stem + "_ocr.txt")
+        parts = ocr_pdf_to_txt_parts(src_path, out_path, blank_pages=blank_pages)
+        for part_path, first, last, total in parts:
+            if last == total:
+                txt_path = part_path
+                break
+
+            await message.answer_document(
+                types.FSInputFile(part_path),
+                caption=t(user_id, "msg_ocr_part", first=first, last=last, total=total),
+            )
+
         if not txt_path:
             await message.answer(t(user_id, "err_ocr_failed"))
             return
@@ -122,6 +201,8 @@ async def handle_pdf(message: types.Message, bot: Bot):
             caption=t(user_id, "msg_ocr_done"),
         )
         logger.info(f"OCR PDF done for user {user_id}")
+        # классы страниц уже посчитаны при OCR — второй рендер не нужен
+        await offer_blank_pages_removal(message, src_path, blank_pages)
         return
 
     # =============================
@@ -134,7 +215,7 @@ async def handle_pdf(message: types.Message, bot: Bot):
 
         await message.answer(t(user_id, "msg_searchable_processing"))
 
-        out_path = create_searchable_pdf(src_path, lang="rus+eng")
+        out_path = create_searchable_pdf(src_path)
         if not out_path:
             await message.answer(t(user_id, "err_searchable_failed"))
             return
@@ -144,6 +225,7 @@ async def handle_pdf(message: types.Message, bot: Bot):
             caption=t(user_id, "msg_searchable_done"),
         )
         logger.info(f"Searchable PDF done for user {user_id}")
+        await offer_blank_pages_removal(message, out_path)
         return
 
     # =============================
@@ -164,28 +246,7 @@ async def handle_pdf(message: types.Message, bot: Bot):
     # MERGE MODE: просто копим PDF
     # =============================
     if mode == "merge":
-        files_list = user_merge_files.setdefault(user_id, [])
-        if len(files_list) >= 10:
-            await message.answer(t(user_id, "merge_too_many"))
-            return
-
-        files_list.append(src_path)
-        count = len(files_list)
-
-        # показываем кнопку "Объединить", когда файлов >= 2
-        if count >= 2:
-            kb = get_merge_keyboard(user_id)
-        else:
-            kb = None
-
-        await message.answer(
-            t(
-                user_id,
-                "merge_file_added",
-                count=count,
-            ),
-            reply_markup=kb,
-        )
+        await add_merge_file(message, src_path)
         return
 
     # =============================
@@ -194,53 +255,60 @@ async def handle_pdf(message: types.Message, bot: Bot):
     if mode == "pdf_text":
         await message.answer(t(user_id, "msg_extracting_text"))
 
-        text_full = extract_text_from_pdf(src_path)
-        if not text_full:
+        # один проход по PDF: раскладка, Markdown и JSON с координатами;
+        # страницы-сканы для PRO распознаются тут же (OCR)
+        result = extract_structured_text(
+            src_path,
+            FILES_DIR / Path(doc_msg.file_name).stem,
+            ocr=await is_pro(user_id),
+        )
+        if result is None:
             await message.answer(t(user_id, "err_no_text_found"))
             return
 
-        txt_path = FILES_DIR / (Path(doc_msg.file_name).stem + ".txt")
-        txt_path.write_text(text_full, encoding="utf-8")
-
-        await message.answer_document(
-            types.FSInputFile(txt_path),
-            caption=t(user_id, "msg_done"),
+        await send_documents(
+            message,
+            [
+                (out_path, t(user_id, f"text_caption_{kind}"))
+                for kind, out_path in result["files"].items()
+            ],
         )
+
+        skipped = result["skipped_scans"]
+        if skipped:
+            await message.answer(
+                t(
+                    user_id,
+                    "text_scans_pro_only",
+                    count=len(skipped),
+                    pages=", ".join(map(str, skipped)),
+                )
+            )
+        elif not result["files"]:
+            await message.answer(t(user_id, "err_no_text_found"))
         return
 
     # =============================
     # SPLIT PDF
     # =============================
-    if mode == "split":
-        await message.answer(t(user_id, "msg_splitting_pdf"))
-
-        pages = split_pdf_to_pages(src_path)
-        if pages is None:
+    if mode == "split" or mode.startswith("split_"):
+        num_pages = split_page_count(src_path)
+        if num_pages is None:
             await message.answer(t(user_id, "err_open_pdf"))
             return
 
-        if len(pages) <= 1:
+        if num_pages <= 1:
             await message.answer(t(user_id, "err_only_one_page"))
             return
 
-        n = len(pages)
+        # способ разделения выбирается кнопками (handlers/split.py)
+        user_split_state[user_id] = {"pdf_path": src_path, "pages": num_pages}
+        user_modes[user_id] = "split_menu"
 
-        if n <= 10:
-            for i, p in enumerate(pages, start=1):
-                await message.answer_document(
-                    types.FSInputFile(p),
-                    caption=t(user_id, "split_page_caption", i=i, n=n),
-                )
-        else:
-            zip_path = FILES_DIR / f"{src_path.stem}_pages.zip"
-            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-                for p in pages:
-                    zf.write(p, arcname=p.name)
-
-            await message.answer_document(
-                types.FSInputFile(zip_path),
-                caption=t(user_id, "split_zip_done", n=n),
-            )
+        await message.answer(
+            t(user_id, "split_choose_mode", num_pages=num_pages),
+            reply_markup=get_split_keyboard(user_id),
+        )
         return
 
     # =============================
@@ -4,6 +4,7 @@ from settings import FILES_DIR
 from pdf_services import image_file_to_pdf
 from utils import check_size_or_reject
 from state import user_modes
+from handlers.merge import add_merge_file
 from i18n import t
 
 router = Router()
@@ -12,7 +13,7 @@ router = Router()
 @router.message(F.photo)
 async def handle_photo(message: types.Message, bot: Bot):
     user_id = message.from_user.id
-    mode = user_modes.get(user_id, "doc_photo")  # пока режим не используем, но может пригодиться
+    mode = user_modes.get(user_id, "doc_photo")
 
     photo = message.photo[-1]
 
@@ -20,7 +21,8 @@ async def handle_photo(message: types.Message, bot: Bot):
     if not await check_size_or_reject(message, photo.file_size):
         return
 
-    await message.answer(t(user_id, "msg_converting_image"))
+    if mode != "merge":
+        await message.answer(t(user_id, "msg_converting_image"))
 
     file = await bot.get_file(photo.file_id)
 
@@ -28,6 +30,11 @@ async def handle_photo(message: types.Message, bot: Bot):
     src_path = FILES_DIR / filename
     await bot.download_file(file.file_path, destination=src_path)
 
+    # в режиме объединения фото становится одной из страниц итогового PDF
+    if mode == "merge":
+        await add_merge_file(message, src_path)
+        return
+
     pdf_path = image_file_to_pdf(src_path)
     if not pdf_path:
         await message.answer(t(user_id, "err_image_convert"))
@@ -0,0 +1,78 @@
+# handlers/split.py
+from pathlib import Path
+
+from aiogram import Router, types, F
+
+from settings import logger
+from state import user_modes, user_split_state
+from pdf_services import split_pdf
+from utils import send_documents
+from i18n import t
+
+router = Router()
+
+
+async def run_split(message: types.Message, user_id: int, groups: list[list[int]] | None) -> None:
+    """
+    Делит PDF из user_split_state и отправляет результат.
+    groups=None — по одной странице; иначе — части с номерами страниц (с 1).
+    """
+    state = user_split_state.get(user_id) or {}
+    pdf_path = state.get("pdf_path")
+    if not pdf_path or not Path(pdf_path).exists():
+        await message.answer(t(user_id, "split_no_pdf"))
+        user_modes[user_id] = "split"
+        return
+
+    await message.answer(t(user_id, "msg_splitting_pdf"))
+
+    # до SPLIT_MAX_FILES частей — отдельными файлами,
+    # больше — части пишутся сразу в ZIP
+    result = split_pdf(Path(pdf_path), groups)
+    if result is None:
+        await message.answer(t(user_id, "err_open_pdf"))
+        return
+
+    n = result["count"]
+    per_page = groups is None
+    if "zip" in result:
+        await message.answer_document(
+            types.FSInputFile(result["zip"]),
+            caption=t(user_id, "split_zip_done" if per_page else "split_zip_parts_done", n=n),
+        )
+    else:
+        caption_key = "split_page_caption" if per_page else "split_part_caption"
+        await send_documents(
+            message,
+            [
+                (p, t(user_id, caption_key, i=i, n=n))
+                for i, p in enumerate(result["files"], start=1)
+            ],
+        )
+
+    # следующий PDF — снова в режиме разделения
+    user_modes[user_id] = "split"
+    user_split_state[user_id] = {}
+    logger.info(f"Split done for user {user_id}: parts={n}")
+
+
+@router.callback_query(F.data.startswith("split:"))
+async def split_choose(callback: types.CallbackQuery):
+    user_id = callback.from_user.id
+    action = callback.data.split(":", 1)[1]
+    state = user_split_state.get(user_id) or {}
+
+    await callback.answer()
+    if user_modes.get(user_id) != "split_menu" or not state.get("pdf_path"):
+        await callback.message.answer(t(user_id, "split_no_pdf"))
+        return
+
+    if action == "pages":
+        await run_split(callback.message, user_id, None)
+        return
+
+    if action in ("every", "size", "ranges"):
+        user_modes[user_id] = f"split_wait_{action}"
+        await callback.message.answer(
+            t(user_id, f"split_ask_{action}", num_pages=state.get("pages", 0))
+        )
@@ -12,11 +12,11 @@ from settings import (
 )
 from state import (
     user_modes,
-    user_merge_files,
     user_watermark_state,
-    user_pages_state,
 )
 from keyboards import get_main_keyboard
+from handlers.merge import drop_merge_session
+from handlers.pages import drop_pages_session
 from i18n import set_user_lang, t
 from legal import PRIVACY_URL, TERMS_URL  # можно оставить, если нужны в тексте /start
 
@@ -38,9 +38,9 @@ async def start_cmd(message: types.Message):
     lang = set_user_lang(user_id, tg_lang)
 
     user_modes[user_id] = "compress"
-    user_merge_files[user_id] = []
+    drop_merge_session(user_id)
     user_watermark_state[user_id] = {}
-    user_pages_state[user_id] = {}
+    drop_pages_session(user_id)
 
     is_pro_now = await is_pro(user_id)
     tier = "PRO" if is_pro_now else "FREE"
@@ -1,21 +1,31 @@
 from pathlib import Path
 
 from aiogram import Router, types, F
-from PyPDF2 import PdfReader, PdfWriter, PdfMerger
 
-from settings import FILES_DIR, logger
+from settings import FILES_DIR, get_user_limit
 from state import (
     user_modes,
-    user_merge_files,
     user_watermark_state,
     user_pages_state,
+    user_split_state,
 )
 from keyboards import (
-    get_pages_menu_keyboard,
     get_rotate_keyboard,
     get_watermark_keyboard,
 )
-from pdf_services import parse_page_range
+from pdf_services import (
+    parse_page_range,
+    parse_page_order,
+    journal_delete,
+    journal_reorder,
+    apply_journal,
+    groups_every_n,
+    groups_by_size,
+    groups_from_ranges,
+)
+from handlers.split import run_split
+from handlers.merge import run_merge, handle_merge_command
+from handlers.pages import pages_menu_keyboard, after_pages_step
 from i18n import t  # ЛОКАЛИЗАЦИЯ
 
 router = Router()
@@ -80,52 +90,44 @@ async def handle_text(message: types.Message):
             await message.answer(t(user_id, "pages_delete_range_failed"))
             return
 
-        delete_set = set(pages)
-
-        try:
-            reader = PdfReader(str(pdf_path))
-        except Exception as e:
-            logger.error(f"Pages delete open error: {e}")
-            await message.answer(t(user_id, "pages_open_error"))
-            return
-
-        writer = PdfWriter()
-        kept = 0
-        for idx, page in enumerate(reader.pages, start=1):
-            if idx in delete_set:
-                continue
-            writer.add_page(page)
-            kept += 1
-
-        if kept == 0:
+        if len(pages) >= num_pages:
             await message.answer(t(user_id, "pages_delete_all_removed"))
             user_modes[user_id] = "pages_menu"
             return
 
-        out_path = FILES_DIR / f"{Path(pdf_path).stem}_deleted.pdf"
-        try:
-            with open(out_path, "wb") as f:
-                writer.write(f)
-        except Exception as e:
-            logger.error(f"Pages delete write error: {e}")
-            await message.answer(t(user_id, "pages_save_error"))
+        # удаление только записывается в журнал, файл соберётся при сохранении
+        kept = journal_delete(state["journal"], pages)
+        state["pages"] = kept
+        user_pages_state[user_id] = state
+        user_modes[user_id] = "pages_menu"
+
+        await message.answer(t(user_id, "pages_delete_done", raw=text_raw, kept=kept))
+        await after_pages_step(message, user_id, state, "pages_continue_editing_full")
+        return
+
+    # ===== РЕДАКТОР СТРАНИЦ: новый ПОРЯДОК страниц =====
+    if mode == "pages_reorder_wait_order":
+        state = user_pages_state.get(user_id) or {}
+        pdf_path = state.get("pdf_path")
+        num_pages = state.get("pages")
+
+        if not pdf_path or not Path(pdf_path).exists() or not num_pages:
+            await message.answer(t(user_id, "pages_no_pdf_editor"))
+            user_modes[user_id] = "compress"
             return
 
-        await message.answer_document(
-            types.FSInputFile(out_path),
-            caption=t(user_id, "pages_delete_done", raw=text_raw, kept=kept),
-        )
+        permutation = parse_page_order(text_raw, num_pages)
+        if permutation is None:
+            await message.answer(t(user_id, "pages_reorder_failed", num_pages=num_pages))
+            return
 
-        user_pages_state[user_id] = {
-            "pdf_path": out_path,
-            "pages": kept,
-        }
+        # перестановка только записывается в журнал, файл соберётся при сохранении
+        journal_reorder(state["journal"], permutation)
+        user_pages_state[user_id] = state
         user_modes[user_id] = "pages_menu"
 
-        await message.answer(
-            t(user_id, "pages_continue_editing_full"),
-            reply_markup=get_pages_menu_keyboard(user_id),
-        )
+        await message.answer(t(user_id, "pages_reorder_done", raw=text_raw))
+        await after_pages_step(message, user_id, state, "pages_continue_editing_full")
         return
 
     # ===== РЕДАКТОР СТРАНИЦ: ввод диапазона для ИЗВЛЕЧЕНИЯ =====
@@ -148,24 +150,15 @@ async def handle_text(message: types.Message):
             await message.answer(t(user_id, "pages_extract_range_failed"))
             return
 
-        try:
-            reader = PdfReader(str(pdf_path))
-        except Exception as e:
-            logger.error(f"Pages extract open error: {e}")
-            await message.answer(t(user_id, "pages_open_error"))
-            return
-
-        writer = PdfWriter()
-        for p in pages:
-            writer.add_page(reader.pages[p - 1])
-
+        # извлечение — сразу файл: выбранные страницы с учётом журнала, один проход
         safe_suffix = text_raw.replace(",", "_").replace("-", "_").replace(" ", "")
-        out_path = FILES_DIR / f"{Path(pdf_path).stem}_extract_{safe_suffix}.pdf"
-        try:
-            with open(out_path, "wb") as f:
-                writer.write(f)
-        except Exception as e:
-            logger.error(f"Pages extract write error: {e}")
+        out_path = apply_journal(
+            Path(pdf_path),
+            state["journal"],
+            FILES_DIR / f"{Path(pdf_path).stem}_extract_{safe_suffix}.pdf",
+            pages,
+        )
+        if not out_path:
             await message.answer(t(user_id, "pages_save_error"))
             return
 
@@ -177,7 +170,7 @@ async def handle_text(message: types.Message):
         user_modes[user_id] = "pages_menu"
         await message.answer(
             t(user_id, "pages_continue_source_edit"),
-            reply_markup=get_pages_menu_keyboard(user_id),
+            reply_markup=pages_menu_keyboard(user_id, state),
         )
         return
 
@@ -214,37 +207,62 @@ async def handle_text(message: types.Message):
         await message.answer(t(user_id, "wm_style_reminder"))
         return
 
-    # ===== MERGE: "Готово" / "done" =====
-    if mode == "merge" and text_val in ("готово", "done", "/done", "/merge"):
-        files_list = user_merge_files.get(user_id, [])
+    # ===== РАЗДЕЛЕНИЕ: параметры способа =====
+    if mode in ("split_wait_every", "split_wait_size", "split_wait_ranges"):
+        state = user_split_state.get(user_id) or {}
+        pdf_path = state.get("pdf_path")
+        num_pages = state.get("pages")
 
-        if len(files_list) < 2:
-            await message.answer(t(user_id, "merge_need_two"))
+        if not pdf_path or not Path(pdf_path).exists() or not num_pages:
+            await message.answer(t(user_id, "split_no_pdf"))
+            user_modes[user_id] = "split"
             return
 
-        await message.answer(
-            t(user_id, "merge_start", count=len(files_list))
-        )
+        groups = None
+        if mode == "split_wait_every":
+            try:
+                every = int(text_raw)
+            except ValueError:
+                every = 0
+            if every <= 0:
+                await message.answer(t(user_id, "split_bad_every"))
+                return
+            groups = groups_every_n(num_pages, every)
+
+        elif mode == "split_wait_size":
+            try:
+                size_mb = float(text_raw.replace(",", "."))
+            except ValueError:
+                size_mb = 0
+            # nan, inf и 1e308 проходят float(); часть больше лимита загрузки не нужна
+            max_bytes = await get_user_limit(user_id)
+            size_bytes = size_mb * 1024 * 1024
+            if not 0 < size_bytes <= max_bytes:
+                await message.answer(
+                    t(user_id, "split_bad_size", max_mb=max_bytes // (1024 * 1024))
+                )
+                return
+            groups = groups_by_size(Path(pdf_path), int(size_bytes))
+            if groups is None:
+                await message.answer(t(user_id, "err_open_pdf"))
+                return
 
-        merged_name = Path(files_list[0]).stem + "_merged.pdf"
-        merged_path = FILES_DIR / merged_name
-
-        try:
-            merger = PdfMerger()
-            for p in files_list:
-                merger.append(str(p))
-            merger.write(str(merged_path))
-            merger.close()
-        except Exception as e:
-            logger.error(e)
-            await message.answer(t(user_id, "merge_error"))
-            return
+        else:
+            groups = groups_from_ranges(text_raw, num_pages)
+            if not groups:
+                await message.answer(t(user_id, "split_bad_ranges"))
+                return
 
-        await message.answer_document(
-            types.FSInputFile(merged_path),
-            caption=t(user_id, "msg_done"),
-        )
-        user_merge_files[user_id] = []
+        await run_split(message, user_id, groups)
+        return
+
+    # ===== MERGE: "Готово" / "done" =====
+    if mode == "merge" and text_val in ("готово", "done", "/done", "/merge"):
+        await run_merge(user_id, message)
+        return
+
+    # ===== MERGE: список / удалить N / порядок 3 1 2 =====
+    if mode == "merge" and await handle_merge_command(message, text_val):
         return
 
     # любые другие текстовые сообщения здесь не обрабатываем
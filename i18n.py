@@ -114,7 +114,12 @@ TEXTS: Dict[str, Dict[str, str]] = {
         "pages_rotate": "🔄 Поворот страниц",
         "pages_delete": "🗑 Удалить страницы",
         "pages_extract": "📤 Извлечь страницы",
+        "pages_reorder": "🔀 Переставить страницы",
         "pages_cancel": "❌ Отмена",
+        "pages_preview": "👁 Предпросмотр",
+        "pages_export": "💾 Сохранить PDF",
+        "pages_step_preview_on": "Превью после каждого шага: вкл",
+        "pages_step_preview_off": "Превью после каждого шага: выкл",
         "pages_back": "↩️ Назад к меню",
 
         # ===== ВОДЯНОЙ ЗНАК =====
@@ -139,9 +144,16 @@ TEXTS: Dict[str, Dict[str, str]] = {
         ),
 
         # ===== MERGE (объединение) =====
-        "merge_need_two": "Добавьте минимум 2 PDF.",
-        "merge_start": "Объединяю {count} PDF...",
+        "merge_need_two": "Добавьте минимум 2 файла.",
+        "merge_start": "Объединяю файлов: {count}...",
         "merge_error": "Ошибка при объединении.",
+        "merge_convert_error": "Не удалось превратить в PDF файл {name} — он будет пропущен.",
+        "merge_append_error": "Не удалось добавить {name} (файл повреждён или защищён паролем) — он пропущен.",
+        "merge_list_header": "Файлы для объединения ({count}):",
+        "merge_list_item": "{index}. {name} — стр.: {pages}",
+        "merge_list_empty": "Пока нет файлов для объединения.",
+        "merge_bad_index": "Укажите номера файлов из списка, например: удалить 2",
+        "merge_bad_order": "Укажите все номера файлов в новом порядке, например: порядок 3 1 2",
         "merge_confirm": "Объединить PDF",
 
         # ===== РЕЖИМЫ =====
@@ -150,7 +162,8 @@ TEXTS: Dict[str, Dict[str, str]] = {
         "mode_doc_photo": "Режим: DOC/IMG → PDF. Пришли документ или файл-изображение.",
         "mode_merge": (
             "Режим: объединение.\n"
-            "Пришли 2–10 PDF-файлов.\n"
+            "Пришли от 2 файлов: PDF, фото, картинки или документы (DOC, XLS, PPT...).\n"
+            "Команды: «список», «удалить 2», «порядок 3 1 2».\n"
             "Потом нажми «Объединить»."
         ),
         "mode_split": "Режим: разделение PDF.\nПришли один PDF.",
@@ -228,6 +241,13 @@ TEXTS: Dict[str, Dict[str, str]] = {
             "• 1,3,5-7\n"
             "• all"
         ),
+        "pages_reorder_ask_order": (
+            "Страниц в файле: {num_pages}.\n\n"
+            "Напиши новый порядок всех страниц — каждую ровно один раз.\n\n"
+            "Примеры:\n"
+            "• 3,1,2,5-10,4\n"
+            "• {num_pages}-1 (в обратном порядке)"
+        ),
         "pages_edit_finished": (
             "Редактирование страниц завершено.\n"
             "Можно выбрать другой режим или прислать PDF для сжатия."
@@ -237,7 +257,15 @@ TEXTS: Dict[str, Dict[str, str]] = {
         "pages_open_error": "Не удалось открыть PDF.",
         "pages_save_error": "Ошибка при сохранении PDF.",
         "pages_rotated_done": "Готово: страницы повёрнуты на {angle}°.",
-        "pages_continue_choose_action": "Можно продолжить редактирование.\nВыбери действие:",
+        "pages_preview_caption": "Предпросмотр: страниц {num_pages}.",
+        "pages_preview_caption_more": "Предпросмотр: первые {shown} из {num_pages} страниц.",
+        "pages_preview_failed": "Не удалось построить предпросмотр.",
+        "pages_export_done": "Готово: все правки применены, страниц: {num_pages}.",
+        "pages_continue_choose_action": (
+            "Можно продолжить редактирование.\n"
+            "Правки применятся одним проходом, когда нажмёшь «💾 Сохранить PDF».\n"
+            "Выбери действие:"
+        ),
         "pages_no_active_doc": "Нет активного документа. Выбери режим и пришли PDF.",
         "pages_menu_header": (
             "Редактор страниц PDF.\n"
@@ -259,6 +287,12 @@ TEXTS: Dict[str, Dict[str, str]] = {
         "msg_ocr_processing": "Распознаю текст в PDF (OCR)...",
         "err_ocr_failed": "Не удалось распознать текст (возможно очень плохое качество скана).",
         "msg_ocr_done": "Готово: OCR-текст из PDF.",
+        "msg_ocr_part": "Страницы {first}–{last} из {total} распознаны. Продолжаю...",
+        "blank_pages_found": "Пустые страницы ({count}): {pages}. Их можно удалить из PDF.",
+        "blank_remove_btn": "🧹 Удалить пустые страницы",
+        "blank_no_data": "Нет данных о пустых страницах. Пришли PDF заново.",
+        "blank_remove_failed": "Не удалось удалить пустые страницы.",
+        "blank_removed_done": "Готово: удалено пустых страниц — {count}.",
 
         # ===== SEARCHABLE PDF =====
         "searchable_pro_only": "Searchable PDF доступен только для PRO-пользователей. См. /pro",
@@ -275,15 +309,22 @@ TEXTS: Dict[str, Dict[str, str]] = {
         ),
 
         # ===== MERGE FROM PDF HANDLER =====
-        "merge_too_many": "Можно объединить не больше 10 файлов за раз.",
+        "merge_too_many": "Можно объединить не больше {limit} файлов за раз.",
         "merge_file_added": (
             "Добавил файл #{count} для объединения.\n"
-            "Пришли ещё PDF или нажми «Объединить»."
+            "Пришли ещё файл или нажми «Объединить»."
         ),
 
         # ===== PDF → TEXT =====
         "msg_extracting_text": "Извлекаю текст...",
         "err_no_text_found": "Текста не найдено (возможно скан или ошибка чтения).",
+        "text_caption_txt": "Текст с сохранением раскладки страниц.",
+        "text_caption_md": "Markdown: заголовки, абзацы и таблицы.",
+        "text_caption_json": "JSON: блоки, строки и слова с координатами (bbox).",
+        "text_scans_pro_only": (
+            "Страницы без текстового слоя (сканы): {count} — {pages}.\n"
+            "В PRO они распознаются (OCR) прямо в этом режиме. См. /pro"
+        ),
 
         # ===== SPLIT =====
         "msg_splitting_pdf": "Разделяю PDF...",
@@ -291,6 +332,24 @@ TEXTS: Dict[str, Dict[str, str]] = {
         "err_only_one_page": "Там всего 1 страница.",
         "split_page_caption": "Страница {i}/{n}",
         "split_zip_done": "Готово: {n} страниц в ZIP.",
+        "split_choose_mode": "В PDF {num_pages} стр. Как разделить?",
+        "split_btn_pages": "📄 По одной странице",
+        "split_btn_every": "🔢 Каждые N страниц",
+        "split_btn_size": "📦 По размеру части (МБ)",
+        "split_btn_ranges": "🧩 По группам диапазонов",
+        "split_ask_every": "Сколько страниц в каждой части? Пришли число (всего страниц: {num_pages}).",
+        "split_ask_size": "Максимальный размер одной части в МБ? Пришли число, например 19.",
+        "split_ask_ranges": (
+            "Пришли группы страниц через «;», например:\n"
+            "1-10;11-30;31-{num_pages}\n"
+            "Каждая группа станет отдельным PDF."
+        ),
+        "split_bad_every": "Нужно целое число больше 0.",
+        "split_bad_size": "Нужно число мегабайт больше 0 и не больше {max_mb}, например 19 или 9.5.",
+        "split_bad_ranges": "Не удалось разобрать группы. Пример: 1-10;11-30",
+        "split_no_pdf": "Нет загруженного PDF. Пришли файл в режиме разделения.",
+        "split_part_caption": "Часть {i}/{n}",
+        "split_zip_parts_done": "Готово: {n} частей в ZIP.",
 
         # ===== COMPRESS =====
         "msg_compressing_pdf": "Сжимаю PDF...",
@@ -316,7 +375,9 @@ TEXTS: Dict[str, Dict[str, str]] = {
             "Можно продолжить редактирование страниц:\n"
             "— Поворот\n"
             "— Удаление\n"
-            "— Извлечение\n\n"
+            "— Извлечение\n"
+            "— Перестановка\n\n"
+            "Правки применятся одним проходом, когда нажмёшь «💾 Сохранить PDF».\n"
             "Выбери действие:"
         ),
         "pages_extract_range_failed": (
@@ -324,6 +385,11 @@ TEXTS: Dict[str, Dict[str, str]] = {
             "Примеры: 2, 1-3, 1,3,5-7 или all."
         ),
         "pages_extract_done": "Готово: извлечены страницы {raw} в отдельный PDF.",
+        "pages_reorder_failed": (
+            "Нужен порядок всех {num_pages} страниц, каждая ровно один раз.\n"
+            "Пример: 3,1,2,5-10,4"
+        ),
+        "pages_reorder_done": "Готово: новый порядок страниц — {raw}.",
         "pages_continue_source_edit": (
             "Можно продолжить редактирование исходного файла.\n"
             "Выбери действие:"
@@ -485,7 +551,12 @@ TEXTS: Dict[str, Dict[str, str]] = {
         "pages_rotate": "🔄 Rotate pages",
         "pages_delete": "🗑 Delete pages",
         "pages_extract": "📤 Extract pages",
+        "pages_reorder": "🔀 Reorder pages",
         "pages_cancel": "❌ Cancel",
+        "pages_preview": "👁 Preview",
+        "pages_export": "💾 Save PDF",
+        "pages_step_preview_on": "Preview after each step: on",
+        "pages_step_preview_off": "Preview after each step: off",
         "pages_back": "↩️ Back to menu",
 
         # ===== WATERMARK =====
@@ -509,9 +580,16 @@ TEXTS: Dict[str, Dict[str, str]] = {
         ),
 
         # ===== MERGE (combine PDFs) =====
-        "merge_need_two": "Add at least 2 PDF files.",
-        "merge_start": "Merging {count} PDFs...",
+        "merge_need_two": "Add at least 2 files.",
+        "merge_start": "Merging {count} files...",
         "merge_error": "Error while merging PDFs.",
+        "merge_convert_error": "Could not convert {name} to PDF — it will be skipped.",
+        "merge_append_error": "Could not add {name} (the file is damaged or password-protected) — it was skipped.",
+        "merge_list_header": "Files to merge ({count}):",
+        "merge_list_item": "{index}. {name} — pages: {pages}",
+        "merge_list_empty": "No files to merge yet.",
+        "merge_bad_index": "Give file numbers from the list, e.g.: remove 2",
+        "merge_bad_order": "Give all file numbers in the new order, e.g.: order 3 1 2",
         "merge_confirm": "Merge PDFs",
 
         # ===== MODES =====
@@ -520,7 +598,8 @@ TEXTS: Dict[str, Dict[str, str]] = {
         "mode_doc_photo": "Mode: DOC/IMG → PDF. Send a document or image file.",
         "mode_merge": (
             "Mode: merge PDFs.\n"
-            "Send 2–10 PDF files.\n"
+            "Send 2 or more files: PDFs, photos, images or documents (DOC, XLS, PPT...).\n"
+            "Commands: “list”, “remove 2”, “order 3 1 2”.\n"
             "Then tap “Merge”."
         ),
         "mode_split": "Mode: split PDF.\nSend one PDF file.",
@@ -598,6 +677,13 @@ TEXTS: Dict[str, Dict[str, str]] = {
             "• 1,3,5-7\n"
             "• all"
         ),
+        "pages_reorder_ask_order": (
+            "The file has {num_pages} pages.\n\n"
+            "Send the new order of all pages — each page exactly once.\n\n"
+            "Examples:\n"
+            "• 3,1,2,5-10,4\n"
+            "• {num_pages}-1 (reverse order)"
+        ),
         "pages_edit_finished": (
             "Page editing finished.\n"
             "You can choose another mode or send a PDF to compress."
@@ -607,7 +693,15 @@ TEXTS: Dict[str, Dict[str, str]] = {
         "pages_open_error": "Failed to open PDF.",
         "pages_save_error": "Error saving PDF.",
         "pages_rotated_done": "Done: pages rotated by {angle}°.",
-        "pages_continue_choose_action": "You can continue editing.\nChoose an action:",
+        "pages_preview_caption": "Preview: {num_pages} pages.",
+        "pages_preview_caption_more": "Preview: first {shown} of {num_pages} pages.",
+        "pages_preview_failed": "Could not build a preview.",
+        "pages_export_done": "Done: all edits applied, pages: {num_pages}.",
+        "pages_continue_choose_action": (
+            "You can continue editing.\n"
+            "All edits are applied in one pass when you tap “💾 Save PDF”.\n"
+            "Choose an action:"
+        ),
         "pages_no_active_doc": "No active document. Choose a mode and send a PDF.",
         "pages_menu_header": (
             "PDF page editor.\n"
@@ -629,6 +723,12 @@ TEXTS: Dict[str, Dict[str, str]] = {
         "msg_ocr_processing": "Running OCR on PDF...",
         "err_ocr_failed": "Failed to recognize text (scan quality might be too low).",
         "msg_ocr_done": "Done: OCR text from PDF.",
+        "msg_ocr_part": "Pages {first}–{last} of {total} recognized. Continuing...",
+        "blank_pages_found": "Blank pages ({count}): {pages}. You can remove them from the PDF.",
+        "blank_remove_btn": "🧹 Remove blank pages",
+        "blank_no_data": "No blank pages info. Please send the PDF again.",
+        "blank_remove_failed": "Failed to remove blank pages.",
+        "blank_removed_done": "Done: {count} blank pages removed.",
 
         # ===== SEARCHABLE PDF =====
         "searchable_pro_only": "Searchable PDF is available only for PRO users. See /pro",
@@ -645,15 +745,22 @@ TEXTS: Dict[str, Dict[str, str]] = {
         ),
 
         # ===== MERGE FROM PDF HANDLER =====
-        "merge_too_many": "You can merge up to 10 files at a time.",
+        "merge_too_many": "You can merge up to {limit} files at a time.",
         "merge_file_added": (
             "File #{count} added for merging.\n"
-            "Send more PDFs or tap “Merge”."
+            "Send another file or tap “Merge”."
         ),
 
         # ===== PDF → TEXT =====
         "msg_extracting_text": "Extracting text...",
         "err_no_text_found": "No text found (maybe a scan or read error).",
+        "text_caption_txt": "Text with page layout preserved.",
+        "text_caption_md": "Markdown: headings, paragraphs and tables.",
+        "text_caption_json": "JSON: blocks, lines and words with coordinates (bbox).",
+        "text_scans_pro_only": (
+            "Pages without a text layer (scans): {count} — {pages}.\n"
+            "With PRO they are recognized (OCR) right in this mode. See /pro"
+        ),
 
         # ===== SPLIT =====
         "msg_splitting_pdf": "Splitting PDF...",
@@ -661,6 +768,24 @@ TEXTS: Dict[str, Dict[str, str]] = {
         "err_only_one_page": "There is only 1 page.",
         "split_page_caption": "Page {i}/{n}",
         "split_zip_done": "Done: {n} pages in ZIP.",
+        "split_choose_mode": "The PDF has {num_pages} pages. How should I split it?",
+        "split_btn_pages": "📄 One page per file",
+        "split_btn_every": "🔢 Every N pages",
+        "split_btn_size": "📦 By part size (MB)",
+        "split_btn_ranges": "🧩 By range groups",
+        "split_ask_every": "How many pages per part? Send a number (total pages: {num_pages}).",
+        "split_ask_size": "Maximum size of one part in MB? Send a number, e.g. 19.",
+        "split_ask_ranges": (
+            "Send page groups separated by “;”, for example:\n"
+            "1-10;11-30;31-{num_pages}\n"
+            "Each group becomes a separate PDF."
+        ),
+        "split_bad_every": "Please send a whole number greater than 0.",
+        "split_bad_size": "Please send a size in MB greater than 0 and at most {max_mb}, e.g. 19 or 9.5.",
+        "split_bad_ranges": "Could not parse the groups. Example: 1-10;11-30",
+        "split_no_pdf": "No PDF loaded. Send a file in split mode.",
+        "split_part_caption": "Part {i}/{n}",
+        "split_zip_parts_done": "Done: {n} parts in ZIP.",
 
         # ===== COMPRESS =====
         "msg_compressing_pdf": "Compressing PDF...",
@@ -686,7 +811,9 @@ TEXTS: Dict[str, Dict[str, str]] = {
             "You can continue editing pages:\n"
             "— Rotate\n"
             "— Delete\n"
-            "— Extract\n\n"
+            "— Extract\n"
+            "— Reorder\n\n"
+            "All edits are applied in one pass when you tap “💾 Save PDF”.\n"
             "Choose an action:"
         ),
         "pages_extract_range_failed": (
@@ -694,6 +821,11 @@ TEXTS: Dict[str, Dict[str, str]] = {
             "Examples: 2, 1-3, 1,3,5-7 or all."
         ),
         "pages_extract_done": "Done: pages {raw} extracted to a separate PDF.",
+        "pages_reorder_failed": (
+            "Give the order of all {num_pages} pages, each exactly once.\n"
+            "Example: 3,1,2,5-10,4"
+        ),
+        "pages_reorder_done": "Done: new page order — {raw}.",
         "pages_continue_source_edit": (
             "You can continue editing the original file.\n"
             "Choose an action:"
@@ -40,9 +40,11 @@ def get_main_keyboard(user_id: int = 0) -> ReplyKeyboardMarkup:
     )
 
 
-def get_pages_menu_keyboard(user_id: int = 0) -> InlineKeyboardMarkup:
+def get_pages_menu_keyboard(user_id: int = 0, step_preview: bool = False) -> InlineKeyboardMarkup:
     """
     Основное меню редактора страниц.
+    Правки копятся в журнале, файл собирается кнопкой «Сохранить PDF».
+    step_preview — включено ли превью после каждого шага (подпись переключателя).
     """
     return InlineKeyboardMarkup(
         inline_keyboard=[
@@ -64,6 +66,28 @@ def get_pages_menu_keyboard(user_id: int = 0) -> InlineKeyboardMarkup:
                     callback_data="pages_action:extract",
                 )
             ],
+            [
+                InlineKeyboardButton(
+                    text=t(user_id, "pages_reorder"),
+                    callback_data="pages_action:reorder",
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text=t(user_id, "pages_preview"),
+                    callback_data="pages_action:preview",
+                ),
+                InlineKeyboardButton(
+                    text=t(user_id, "pages_export"),
+                    callback_data="pages_action:export",
+                ),
+            ],
+            [
+                InlineKeyboardButton(
+                    text=t(user_id, "pages_step_preview_on" if step_preview else "pages_step_preview_off"),
+                    callback_data="pages_action:step_preview",
+                )
+            ],
             [
                 InlineKeyboardButton(
                     text=t(user_id, "pages_cancel"),
@@ -150,3 +174,50 @@ def get_merge_keyboard(user_id: int = 0) -> InlineKeyboardMarkup:
             ]
         ]
     )
+
+
+def get_blank_pages_keyboard(user_id: int = 0) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=t(user_id, "blank_remove_btn"),
+                    callback_data="blank:remove",
+                )
+            ]
+        ]
+    )
+
+
+def get_split_keyboard(user_id: int = 0) -> InlineKeyboardMarkup:
+    """
+    Выбор способа разделения PDF.
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=t(user_id, "split_btn_pages"),
+                    callback_data="split:pages",
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text=t(user_id, "split_btn_every"),
+                    callback_data="split:every",
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text=t(user_id, "split_btn_size"),
+                    callback_data="split:size",
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    text=t(user_id, "split_btn_ranges"),
+                    callback_data="split:ranges",
+                )
+            ],
+        ]
+    )
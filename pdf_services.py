@@ -4,12 +4,39 @@ from services.converters.office_to_pdf import office_doc_to_pdf
 from services.converters.pdf import (
     apply_watermark,
     parse_page_range,
+    parse_page_order,
     rotate_page_inplace,
+    rotate_pages_incremental,
     ocr_pdf_to_txt,
+    ocr_pdf_to_txt_parts,
     create_searchable_pdf,
+    find_blank_pages,
+    remove_pages,
+    split_pdf,
+    split_page_count,
     split_pdf_to_pages,
+    split_pdf_to_zip,
+    extract_pages,
+    groups_every_n,
+    groups_by_size,
+    groups_from_ranges,
+    count_pages,
+    drop_document,
+    evict_idle_documents,
+    new_journal,
+    journal_page_count,
+    journal_rotate,
+    journal_delete,
+    journal_reorder,
+    apply_journal,
+    render_journal_preview,
     merge_pdfs,
-    extract_text_from_pdf,
+    create_merge_session,
+    append_to_merge_session,
+    reorder_merge_session,
+    finish_merge_session,
+    discard_merge_session,
+    extract_structured_text,
     compress_pdf,
     convert_to_pdf,
 )
@@ -19,12 +46,39 @@ __all__ = [
     "office_doc_to_pdf",
     "apply_watermark",
     "parse_page_range",
+    "parse_page_order",
     "rotate_page_inplace",
+    "rotate_pages_incremental",
     "ocr_pdf_to_txt",
+    "ocr_pdf_to_txt_parts",
     "create_searchable_pdf",
+    "find_blank_pages",
+    "remove_pages",
+    "split_pdf",
+    "split_page_count",
     "split_pdf_to_pages",
+    "split_pdf_to_zip",
+    "extract_pages",
+    "groups_every_n",
+    "groups_by_size",
+    "groups_from_ranges",
+    "count_pages",
+    "drop_document",
+    "evict_idle_documents",
+    "new_journal",
+    "journal_page_count",
+    "journal_rotate",
+    "journal_delete",
+    "journal_reorder",
+    "apply_journal",
+    "render_journal_preview",
     "merge_pdfs",
-    "extract_text_from_pdf",
+    "create_merge_session",
+    "append_to_merge_session",
+    "reorder_merge_session",
+    "finish_merge_session",
+    "discard_merge_session",
+    "extract_structured_text",
     "compress_pdf",
     "convert_to_pdf",
 ]
\ No newline at end of file
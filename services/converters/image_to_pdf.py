@@ -5,12 +5,13 @@ from PIL import Image
 from settings import FILES_DIR, logger
 
 
-def image_file_to_pdf(src_path: Path) -> Path | None:
+def image_file_to_pdf(src_path: Path, out_path: Path | None = None) -> Path | None:
     """
     Конвертирует файл-изображение в PDF.
+    out_path — куда писать PDF; None — FILES_DIR / "<имя исходника>.pdf".
     Возвращает путь к PDF или None при ошибке.
     """
-    pdf_path = FILES_DIR / (src_path.stem + ".pdf")
+    pdf_path = out_path or FILES_DIR / (src_path.stem + ".pdf")
     try:
         img = Image.open(src_path).convert("RGB")
         img.save(pdf_path, "PDF")
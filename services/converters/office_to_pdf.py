@@ -1,8 +1,18 @@
+import shutil
 import subprocess
+import tempfile
+import threading
 import zipfile
 from pathlib import Path
 
-from settings import FILES_DIR, logger
+from settings import FILES_DIR, TMP_DIR, logger
+
+
+# Сколько LibreOffice может работать одновременно (конвертации идут из потоков,
+# например при объединении нескольких документов); каждый процесс тяжёлый
+OFFICE_MAX_PARALLEL = 2
+
+_office_slots = threading.BoundedSemaphore(OFFICE_MAX_PARALLEL)
 
 
 def has_embedded_fonts(docx_path: Path) -> bool:
@@ -51,13 +61,18 @@ def has_embedded_fonts(docx_path: Path) -> bool:
         return False
 
 
-def office_doc_to_pdf(src_path: Path) -> Path | None:
+def office_doc_to_pdf(src_path: Path, out_path: Path | None = None) -> Path | None:
     """
     Конвертирует офисный документ (DOC/DOCX/XLSX/PPTX...) в PDF через LibreOffice.
     Работает в Docker/Railway через xvfb-run.
 
     Дополнительно:
     - если это DOCX, перед конвертацией логируем, есть ли встроенные шрифты (Embed fonts).
+
+    Каждый запуск — со своим профилем LibreOffice и своей папкой вывода:
+    несколько конвертаций могут идти параллельно и не подхватят чужой PDF.
+    Результат — out_path или, если он не задан, FILES_DIR / "<имя исходника>.pdf"
+    (параллельным конвертациям файлов с одним именем нужен свой out_path).
     """
     src_path = Path(src_path)
 
@@ -75,43 +90,54 @@ def office_doc_to_pdf(src_path: Path) -> Path | None:
 
     FILES_DIR.mkdir(parents=True, exist_ok=True)
 
-    cmd = [
-        "xvfb-run",
-        "--auto-servernum",
-        "--server-args=-screen 0 1024x768x24",
-        lo_path,
-        "--headless",
-        "--nologo",
-        "--nofirststartwizard",
-        "--convert-to",
-        "pdf:writer_pdf_Export",
-        "--outdir",
-        str(FILES_DIR),
-        str(src_path),
-    ]
-    logger.info("Running LibreOffice: %s", " ".join(cmd))
-
-    proc = subprocess.run(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-
-    logger.info("LibreOffice return code: %s", proc.returncode)
-    logger.info("LibreOffice stdout: %s", (proc.stdout or "").strip())
-    logger.info("LibreOffice stderr: %s", (proc.stderr or "").strip())
-
-    if proc.returncode != 0:
-        logger.error("LibreOffice failed with nonzero exit code")
-        return None
-
-    pdf_candidates = list(FILES_DIR.glob("*.pdf"))
-    logger.info("PDF candidates found: %s", pdf_candidates)
-
-    if not pdf_candidates:
-        logger.error("PDF not found after LibreOffice conversion.")
-        return None
-
-    pdf_candidates.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return pdf_candidates[0]
\ No newline at end of file
+    with _office_slots, tempfile.TemporaryDirectory(dir=TMP_DIR) as run_dir:
+        run_dir = Path(run_dir)
+        out_dir = run_dir / "out"
+        profile_dir = run_dir / "profile"
+
+        cmd = [
+            "xvfb-run",
+            "--auto-servernum",
+            "--server-args=-screen 0 1024x768x24",
+            lo_path,
+            f"-env:UserInstallation={profile_dir.as_uri()}",
+            "--headless",
+            "--nologo",
+            "--nofirststartwizard",
+            "--convert-to",
+            "pdf:writer_pdf_Export",
+            "--outdir",
+            str(out_dir),
+            str(src_path),
+        ]
+        logger.info("Running LibreOffice: %s", " ".join(cmd))
+
+        try:
+            proc = subprocess.run(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except OSError as e:
+            logger.error("LibreOffice could not be started: %s", e)
+            return None
+
+        logger.info("LibreOffice return code: %s", proc.returncode)
+        logger.info("LibreOffice stdout: %s", (proc.stdout or "").strip())
+        logger.info("LibreOffice stderr: %s", (proc.stderr or "").strip())
+
+        if proc.returncode != 0:
+            logger.error("LibreOffice failed with nonzero exit code")
+            return None
+
+        # LibreOffice называет результат по исходнику: <stem>.pdf
+        produced = out_dir / f"{src_path.stem}.pdf"
+        if not produced.exists():
+            logger.error("PDF not found after LibreOffice conversion: %s", produced)
+            return None
+
+        pdf_path = out_path or FILES_DIR / produced.name
+        shutil.move(str(produced), pdf_path)
+
+    return pdf_path
@@ -1,23 +1,77 @@
 from .watermark import apply_watermark
-from .pages import parse_page_range
-from .rotate import rotate_page_inplace
-from .ocr import ocr_pdf_to_txt
+from .pages import parse_page_range, parse_page_order
+from .rotate import rotate_page_inplace, rotate_pages_incremental
+from .ocr import ocr_pdf_to_txt, ocr_pdf_to_txt_parts
 from .searchable import create_searchable_pdf
-from .split import split_pdf_to_pages
+from .blank import find_blank_pages, remove_pages
+from .split import (
+    split_pdf,
+    split_page_count,
+    split_pdf_to_pages,
+    split_pdf_to_zip,
+    extract_pages,
+    groups_every_n,
+    groups_by_size,
+    groups_from_ranges,
+)
+from .doc_cache import count_pages, drop_document, evict_idle_documents
+from .page_journal import (
+    new_journal,
+    journal_page_count,
+    journal_rotate,
+    journal_delete,
+    journal_reorder,
+    apply_journal,
+    render_journal_preview,
+)
 from .merge import merge_pdfs
-from .extract_text import extract_text_from_pdf
+from .merge_session import (
+    create_merge_session,
+    append_to_merge_session,
+    reorder_merge_session,
+    finish_merge_session,
+    discard_merge_session,
+)
+from .extract_text import extract_structured_text
 from .compress import compress_pdf
 from .convert import convert_to_pdf
 
 __all__ = [
     "apply_watermark",
     "parse_page_range",
+    "parse_page_order",
     "rotate_page_inplace",
+    "rotate_pages_incremental",
     "ocr_pdf_to_txt",
+    "ocr_pdf_to_txt_parts",
     "create_searchable_pdf",
+    "find_blank_pages",
+    "remove_pages",
+    "split_pdf",
+    "split_page_count",
     "split_pdf_to_pages",
+    "split_pdf_to_zip",
+    "extract_pages",
+    "groups_every_n",
+    "groups_by_size",
+    "groups_from_ranges",
+    "count_pages",
+    "drop_document",
+    "evict_idle_documents",
+    "new_journal",
+    "journal_page_count",
+    "journal_rotate",
+    "journal_delete",
+    "journal_reorder",
+    "apply_journal",
+    "render_journal_preview",
     "merge_pdfs",
-    "extract_text_from_pdf",
+    "create_merge_session",
+    "append_to_merge_session",
+    "reorder_merge_session",
+    "finish_merge_session",
+    "discard_merge_session",
+    "extract_structured_text",
     "compress_pdf",
     "convert_to_pdf",
 ]
\ No newline at end of file
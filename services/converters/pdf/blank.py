@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import fitz
+
+from settings import FILES_DIR, logger
+from services.converters.pdf.page_analysis import BLANK_PAGE_KINDS, classify_page
+
+
+def find_blank_pages(pdf_path: Path) -> list[int]:
+    """
+    Номера (с 1) пустых и почти пустых страниц PDF.
+    Дёшево: текстовый слой + грубый рендер только страниц без текста.
+    При ошибке возвращает [].
+    """
+    try:
+        with fitz.open(str(pdf_path)) as pdf_doc:
+            return [
+                page.number + 1
+                for page in pdf_doc
+                if classify_page(page)[0] in BLANK_PAGE_KINDS
+            ]
+    except Exception as e:
+        logger.error(f"Blank pages detection error: {e}")
+        return []
+
+
+def remove_pages(pdf_path: Path, pages: list[int]) -> Path | None:
+    """
+    Удаляет страницы (номера с 1) и сохраняет PDF рядом с суффиксом _no_blank.
+    Возвращает путь или None, если после удаления ничего не осталось / ошибка.
+    """
+    try:
+        with fitz.open(str(pdf_path)) as pdf_doc:
+            drop = set(pages)
+            keep = [i for i in range(len(pdf_doc)) if i + 1 not in drop]
+            if not keep:
+                return None
+
+            pdf_doc.select(keep)
+            out_path = FILES_DIR / f"{pdf_path.stem}_no_blank.pdf"
+            pdf_doc.save(str(out_path), garbage=3, deflate=True)
+    except Exception as e:
+        logger.error(f"Remove pages error: {e}")
+        return None
+
+    return out_path if out_path.exists() else None
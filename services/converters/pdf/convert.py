@@ -9,10 +9,11 @@ IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".tif", ".tiff", ".bmp"}
 OFFICE_EXTS = {".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".odt", ".ods", ".odp"}
 
 
-def convert_to_pdf(src_path: Path) -> Optional[Path]:
+def convert_to_pdf(src_path: Path, out_path: Optional[Path] = None) -> Optional[Path]:
     """
     Универсальная конвертация любого поддерживаемого файла в PDF.
     Если файл уже PDF — возвращает его как есть.
+    out_path — куда писать результат конвертации (None — FILES_DIR).
     """
     suffix = src_path.suffix.lower()
 
@@ -20,9 +21,9 @@ def convert_to_pdf(src_path: Path) -> Optional[Path]:
         return src_path
 
     if suffix in IMAGE_EXTS:
-        return image_file_to_pdf(src_path)
+        return image_file_to_pdf(src_path, out_path)
 
     if suffix in OFFICE_EXTS:
-        return office_doc_to_pdf(src_path)
+        return office_doc_to_pdf(src_path, out_path)
 
     return None
\ No newline at end of file
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import fitz
+
+from settings import EDITOR_CACHE_MAX_BYTES, EDITOR_CACHE_IDLE_SECONDS, logger
+
+
+# path -> {"doc": fitz.Document, "stamp": (mtime_ns, size), "bytes": int, "used": float};
+# порядок — от давно использованных к недавним (LRU)
+_docs: OrderedDict[str, dict] = OrderedDict()
+_total_bytes = 0
+_lock = threading.Lock()
+
+
+def _close(key: str) -> None:
+    """Закрывает и убирает документ из кэша (под _lock)."""
+    global _total_bytes
+
+    entry = _docs.pop(key, None)
+    if entry is None:
+        return
+    _total_bytes -= entry["bytes"]
+    try:
+        entry["doc"].close()
+    except Exception as e:
+        logger.error(f"Editor doc cache close error: {e}")
+
+
+def _evict(now: float, keep: str | None = None) -> None:
+    """Выкидывает простаивающие документы и самые старые сверх бюджета (под _lock)."""
+    for key in [k for k, e in _docs.items() if now - e["used"] > EDITOR_CACHE_IDLE_SECONDS]:
+        _close(key)
+
+    while _total_bytes > EDITOR_CACHE_MAX_BYTES and len(_docs) > 1:
+        oldest = next(iter(_docs))
+        if oldest == keep:
+            break
+        _close(oldest)
+
+
+def get_document(pdf_path: Path) -> fitz.Document:
+    """
+    Открытый документ fitz для сессии редактора страниц: разбирается
+    один раз, следующие действия с тем же файлом работают с готовым объектом.
+    Кэш LRU с бюджетом памяти (оценка — размер файла) и вытеснением
+    по простою. Если файл на диске поменялся — документ открывается заново.
+    Документ только читается: вызывающий код не должен его менять.
+    """
+    key = str(Path(pdf_path).resolve())
+    st = Path(key).stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    now = time.monotonic()
+
+    global _total_bytes
+    with _lock:
+        entry = _docs.get(key)
+        if entry is not None and entry["stamp"] != stamp:
+            _close(key)
+            entry = None
+
+        if entry is None:
+            entry = {"doc": fitz.open(key), "stamp": stamp, "bytes": st.st_size, "used": now}
+            _docs[key] = entry
+            _total_bytes += entry["bytes"]
+        else:
+            entry["used"] = now
+            _docs.move_to_end(key)
+
+        _evict(now, keep=key)
+        return entry["doc"]
+
+
+def count_pages(pdf_path: Path) -> int | None:
+    """Число страниц (документ заодно попадает в кэш редактора). None — не открылся."""
+    try:
+        return get_document(pdf_path).page_count
+    except Exception as e:
+        logger.error(f"Editor doc open error: {e}")
+        return None
+
+
+def drop_document(pdf_path: Path) -> None:
+    """Закрывает документ сессии (выход из редактора)."""
+    with _lock:
+        _close(str(Path(pdf_path).resolve()))
+
+
+def evict_idle_documents() -> None:
+    """Закрывает документы, которыми не пользовались дольше EDITOR_CACHE_IDLE_SECONDS."""
+    with _lock:
+        _evict(time.monotonic())
@@ -1,29 +1,188 @@
+import json
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Callable, Iterator
 
-from PyPDF2 import PdfReader
+import fitz
 
-from settings import logger
+from settings import TEXT_EXTRACT_WORKERS, logger
+from services.converters.pdf.ocr_engine import detect_ocr_lang, ocr_page
+from services.converters.pdf.page_analysis import (
+    OCR_PAGE_KINDS,
+    SCAN_MAX_TEXT_CHARS,
+    classify_page,
+    choose_ocr_render,
+)
+from services.converters.pdf.text_structure import (
+    layout_text,
+    markdown_text,
+    ocr_structure,
+    page_structure,
+)
 
 
-def extract_text_from_pdf(pdf_path: Path) -> str | None:
+# Страницы раздаются процессам кусками; маленькие PDF читаются в текущем процессе
+TEXT_CHUNK_PAGES = 32
+TEXT_PARALLEL_MIN_PAGES = 64
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Общий пул процессов (spawn: бот многопоточный, fork небезопасен)."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=TEXT_EXTRACT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def _structure_pages(pdf_path: str, start: int, stop: int) -> list[dict]:
+    """
+    Для страниц [start, stop) за один разбор текста:
+    {"text": раскладка, "markdown": Markdown, "json": структура страницы}.
+    Растровые страницы (скан без текстового слоя) помечаются {"scan": True} —
+    их OCR делает основной процесс, где живут движки tesseract.
+    """
+    results = []
+    with fitz.open(pdf_path) as pdf_doc:
+        for i in range(start, stop):
+            page = pdf_doc[i]
+            structure = page_structure(page)
+
+            chars = sum(len(line["text"]) for block in structure["blocks"] for line in block["lines"])
+            if chars < SCAN_MAX_TEXT_CHARS and classify_page(page)[0] in OCR_PAGE_KINDS:
+                results.append({"scan": True})
+                continue
+
+            results.append({
+                "text": layout_text(structure),
+                "markdown": markdown_text(page, structure),
+                "json": structure,
+            })
+    return results
+
+
+def _ocr_page_result(page: fitz.Page, lang: str) -> dict:
+    """Результат как у _structure_pages, но из OCR растровой страницы."""
+    dpi, _ = choose_ocr_render(page)
+    words = ocr_page(page, lang=lang, dpi=dpi)["words"]
+    structure = ocr_structure(page, words, scale=72 / dpi)
+    return {
+        "text": layout_text(structure),
+        "markdown": markdown_text(None, structure),
+        "json": structure,
+    }
+
+
+def _empty_page_result(page: fitz.Page) -> dict:
+    return {
+        "text": "",
+        "markdown": "",
+        "json": {
+            "number": page.number + 1,
+            "width": round(page.rect.width, 2),
+            "height": round(page.rect.height, 2),
+            "blocks": [],
+        },
+    }
+
+
+def _iter_page_results(
+    worker: Callable[[str, int, int], list],
+    pdf_path: Path,
+    total: int,
+) -> Iterator:
+    """
+    Результаты worker по страницам, по порядку. Большие документы читаются
+    кусками в процессах пула; в работе не больше 2 кусков на процесс,
+    так что память не зависит от размера документа.
+    """
+    ranges = [
+        (start, min(start + TEXT_CHUNK_PAGES, total))
+        for start in range(0, total, TEXT_CHUNK_PAGES)
+    ]
+
+    if total < TEXT_PARALLEL_MIN_PAGES or TEXT_EXTRACT_WORKERS <= 1:
+        for start, stop in ranges:
+            yield from worker(str(pdf_path), start, stop)
+        return
+
+    pool = _get_pool()
+    window = 2 * TEXT_EXTRACT_WORKERS
+    pending = deque()
+    for start, stop in ranges:
+        pending.append(pool.submit(worker, str(pdf_path), start, stop))
+        if len(pending) >= window:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def extract_structured_text(pdf_path: Path, out_stem: Path, ocr: bool = False) -> dict | None:
     """
-    Извлекает текст из обычного PDF (не скана).
-    Возвращает строку или None при ошибке/отсутствии текста.
+    Один проход по PDF -> три файла рядом с out_stem:
+      - .txt  — текст с сохранением раскладки,
+      - .md   — Markdown с заголовками и таблицами,
+      - .json — {"pages": [...]} с блоками, строками и словами и их bbox.
+    Всё пишется постранично, без сборки документа в памяти.
+    Растровые страницы при ocr=True распознаются в этом же проходе
+    (языки — detect_ocr_lang по первому скану), при ocr=False остаются пустыми.
+    Возвращает {"files": {"txt": path, "md": path, "json": path} или {},
+    если текста нет, "skipped_scans": [номера нераспознанных сканов]}
+    или None при ошибке.
     """
+    global _pool
+
     try:
-        reader = PdfReader(str(pdf_path))
+        pdf_doc = fitz.open(str(pdf_path))
     except Exception as e:
         logger.error(f"PDF text open error: {e}")
         return None
 
-    text_chunks: list[str] = []
+    paths = {ext: out_stem.parent / f"{out_stem.name}.{ext}" for ext in ("txt", "md", "json")}
+    has_text = False
+    skipped_scans: list[int] = []
+    lang = None
     try:
-        for page in reader.pages:
-            txt = page.extract_text() or ""
-            text_chunks.append(txt)
+        with (
+            paths["txt"].open("w", encoding="utf-8") as txt_file,
+            paths["md"].open("w", encoding="utf-8") as md_file,
+            paths["json"].open("w", encoding="utf-8") as json_file,
+        ):
+            json_file.write('{"pages": [')
+            for i, result in enumerate(_iter_page_results(_structure_pages, pdf_path, len(pdf_doc))):
+                if result.get("scan"):
+                    page = pdf_doc[i]
+                    if ocr:
+                        lang = lang or detect_ocr_lang(pdf_doc, [i])
+                        result = _ocr_page_result(page, lang)
+                    else:
+                        skipped_scans.append(i + 1)
+                        result = _empty_page_result(page)
+
+                if i:
+                    txt_file.write("\n\f\n")
+                    md_file.write("\n\n---\n\n")
+                    json_file.write(",\n")
+                txt_file.write(result["text"])
+                md_file.write(result["markdown"])
+                json.dump(result["json"], json_file, ensure_ascii=False)
+                has_text = has_text or bool(result["json"]["blocks"])
+            json_file.write("]}\n")
+    except BrokenProcessPool as e:
+        logger.error(f"PDF text worker pool error: {e}")
+        _pool = None
+        return None
     except Exception as e:
-        logger.error(f"PDF text extract error: {e}")
+        logger.error(f"PDF structured text error: {e}")
         return None
+    finally:
+        pdf_doc.close()
 
-    text_full = "\n\n".join(text_chunks).strip()
-    return text_full or None
\ No newline at end of file
+    return {"files": paths if has_text else {}, "skipped_scans": skipped_scans}
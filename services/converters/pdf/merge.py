@@ -1,29 +1,283 @@
+import hashlib
 from pathlib import Path
 from typing import Sequence
 
-from PyPDF2 import PdfMerger
+import pikepdf
 
 from settings import logger
 
 
+# Ключи FontDescriptor с потоками встроенных шрифтов
+_FONT_FILE_KEYS = ("/FontFile", "/FontFile2", "/FontFile3")
+
+
+def _page_index(src: pikepdf.Pdf) -> dict:
+    """objgen страницы -> её индекс в src (для переноса закладок)."""
+    return {page.obj.objgen: i for i, page in enumerate(src.pages)}
+
+
+def _named_dest(src: pikepdf.Pdf, name) -> pikepdf.Object | None:
+    """Именованное назначение: /Root/Names/Dests (дерево имён) или старый /Root/Dests."""
+    root = src.Root
+    dest = None
+    if isinstance(name, pikepdf.String) and "/Names" in root and "/Dests" in root.Names:
+        dest = pikepdf.NameTree(root.Names.Dests).get(str(name))
+    elif isinstance(name, pikepdf.Name) and "/Dests" in root:
+        dest = root.Dests.get(name)
+
+    if isinstance(dest, pikepdf.Dictionary):
+        dest = dest.get("/D")
+    return dest
+
+
+def _item_dest_page(src: pikepdf.Pdf, item: pikepdf.OutlineItem, pages: dict):
+    """
+    (индекс страницы в src, назначение) для закладки или (None, None),
+    если закладка ведёт не на страницу документа (URI, другой файл и т.п.).
+    """
+    dest = item.destination
+    if dest is None and item.action is not None and item.action.get("/S") == "/GoTo":
+        dest = item.action.get("/D")
+    if isinstance(dest, (pikepdf.String, pikepdf.Name)):
+        dest = _named_dest(src, dest)
+
+    if not isinstance(dest, pikepdf.Array) or len(dest) == 0:
+        return None, None
+    target = dest[0]
+    if not isinstance(target, pikepdf.Dictionary):
+        return None, None
+    return pages.get(target.objgen), dest
+
+
+def _copy_outline_items(
+    src: pikepdf.Pdf,
+    out: pikepdf.Pdf,
+    items: list,
+    pages: dict,
+    offset: int,
+) -> list:
+    """
+    Копирует закладки src в закладки итогового файла: назначение
+    перенаправляется на ту же страницу в out (сдвиг offset), вид
+    (/XYZ, /Fit, ...) сохраняется. Закладки не на страницы документа
+    отбрасываются, их дети поднимаются на уровень выше.
+    """
+    result = []
+    for item in items:
+        children = _copy_outline_items(src, out, item.children, pages, offset)
+        index, dest = _item_dest_page(src, item, pages)
+        if index is None:
+            result.extend(children)
+            continue
+
+        new_dest = pikepdf.Array([out.pages[offset + index].obj])
+        for value in list(dest)[1:]:
+            new_dest.append(value)
+
+        new_item = pikepdf.OutlineItem(item.title, new_dest)
+        new_item.is_closed = item.is_closed
+        new_item.children = children
+        result.append(new_item)
+    return result
+
+
+def _read_outline(src: pikepdf.Pdf, out: pikepdf.Pdf, offset: int) -> list:
+    """Закладки src для итогового файла; битые закладки не мешают склейке."""
+    try:
+        root = src.open_outline().root
+        return _copy_outline_items(src, out, root, _page_index(src), offset)
+    except Exception as e:
+        logger.warning(f"Merge PDFs: outline skipped: {e}")
+        return []
+
+
+def _stream_signature(stream: pikepdf.Stream) -> tuple:
+    """Дешёвый ключ для сравнения потоков: длина данных и словарь без /Length."""
+    stream_dict = pikepdf.Dictionary(stream.stream_dict)
+    length = int(stream_dict.get("/Length", 0))
+    if "/Length" in stream_dict:
+        del stream_dict["/Length"]
+    return length, stream_dict.unparse()
+
+
+def _canonical_stream(stream: pikepdf.Stream, buckets: dict, seen: dict) -> pikepdf.Stream:
+    """
+    Первый встреченный поток с теми же байтами и словарём, что у stream
+    (или сам stream). Хэш данных считается только при совпадении
+    длины и словаря с уже виденным потоком — остальные не читаются.
+    buckets: сигнатура -> [[sha256 или None, поток], ...];
+    seen: objgen -> канонический поток (повторные ссылки на тот же объект).
+    """
+    if stream.objgen in seen:
+        return seen[stream.objgen]
+
+    bucket = buckets.setdefault(_stream_signature(stream), [])
+    digest = None
+    canonical = stream
+    for entry in bucket:
+        if digest is None:
+            digest = hashlib.sha256(stream.read_raw_bytes()).digest()
+        if entry[0] is None:
+            entry[0] = hashlib.sha256(entry[1].read_raw_bytes()).digest()
+        if entry[0] == digest:
+            canonical = entry[1]
+            break
+    else:
+        bucket.append([digest, stream])
+
+    seen[stream.objgen] = canonical
+    return canonical
+
+
+def _dedupe_font(font: pikepdf.Dictionary, buckets: dict, seen: dict) -> None:
+    """Заменяет встроенный файл шрифта (и у потомков Type0) на канонический."""
+    fonts = [font]
+    descendants = font.get("/DescendantFonts")
+    if isinstance(descendants, pikepdf.Array):
+        fonts.extend(d for d in descendants if isinstance(d, pikepdf.Dictionary))
+
+    for f in fonts:
+        descriptor = f.get("/FontDescriptor")
+        if not isinstance(descriptor, pikepdf.Dictionary):
+            continue
+        for key in _FONT_FILE_KEYS:
+            stream = descriptor.get(key)
+            if isinstance(stream, pikepdf.Stream) and stream.is_indirect:
+                descriptor[key] = _canonical_stream(stream, buckets, seen)
+
+
+def _dedupe_image(image: pikepdf.Stream, buckets: dict, seen: dict) -> pikepdf.Stream:
+    """Канонический поток картинки; сначала — её маска, чтобы ссылки на маски совпали."""
+    smask = image.stream_dict.get("/SMask")
+    if isinstance(smask, pikepdf.Stream) and smask.is_indirect and image.objgen not in seen:
+        image.stream_dict["/SMask"] = _canonical_stream(smask, buckets, seen)
+    return _canonical_stream(image, buckets, seen)
+
+
+def _dedupe_resources(resources, buckets: dict, seen: dict, visited: set) -> None:
+    """Шрифты и картинки словаря /Resources, с заходом в формы (Form XObject)."""
+    if not isinstance(resources, pikepdf.Dictionary):
+        return
+    if resources.is_indirect:
+        if resources.objgen in visited:
+            return
+        visited.add(resources.objgen)
+
+    fonts = resources.get("/Font")
+    if isinstance(fonts, pikepdf.Dictionary):
+        for _, font in fonts.items():
+            if isinstance(font, pikepdf.Dictionary):
+                _dedupe_font(font, buckets, seen)
+
+    xobjects = resources.get("/XObject")
+    if not isinstance(xobjects, pikepdf.Dictionary):
+        return
+    for name, xobj in list(xobjects.items()):
+        if not isinstance(xobj, pikepdf.Stream) or not xobj.is_indirect:
+            continue
+        subtype = xobj.stream_dict.get("/Subtype")
+        if subtype == "/Image":
+            xobjects[name] = _dedupe_image(xobj, buckets, seen)
+        elif subtype == "/Form" and xobj.objgen not in visited:
+            visited.add(xobj.objgen)
+            _dedupe_resources(xobj.stream_dict.get("/Resources"), buckets, seen, visited)
+
+
+def open_merge_output() -> dict:
+    """
+    Итог объединения, который растёт по одному файлу (append_to_merge_output):
+    {"pdf": итоговый pikepdf.Pdf, "sources": открытые исходники,
+     "buckets", "seen", "visited": состояние сведения одинаковых потоков}.
+    Исходники открыты до save_merge_output: qpdf дочитывает из них потоки при записи.
+    """
+    return {
+        "pdf": pikepdf.Pdf.new(),
+        "sources": [],
+        "buckets": {},
+        "seen": {},
+        "visited": set(),
+    }
+
+
+def append_to_merge_output(output: dict, pdf_path: Path) -> tuple[list, list]:
+    """
+    Дописывает страницы pdf_path в конец итога. Объекты копируются ссылками,
+    одинаковые встроенные шрифты и картинки (одинаковые байты и словарь)
+    сводятся к уже встреченным — дубликаты остаются без ссылок и не пишутся.
+    Возвращает (страницы файла в итоге, закладки файла); ошибки — исключением.
+    """
+    out = output["pdf"]
+    src = pikepdf.open(pdf_path)
+    output["sources"].append(src)
+
+    offset = len(out.pages)
+    out.pages.extend(src.pages)
+    pages = out.pages[offset:]
+    for page in pages:
+        _dedupe_resources(
+            page.obj.get("/Resources"),
+            output["buckets"],
+            output["seen"],
+            output["visited"],
+        )
+    return pages, _read_outline(src, out, offset)
+
+
+def save_merge_output(output: dict, pages: list, outline_items: list, out_path: Path) -> None:
+    """
+    Пишет итог в out_path: pages — страницы итога в нужном порядке
+    (не вошедшие выпадают вместе с объектами, на которые ссылались только они),
+    outline_items — закладки для этих страниц.
+    """
+    out = output["pdf"]
+    if [page.obj.objgen for page in out.pages] != [page.obj.objgen for page in pages]:
+        # страницы переставляются теми же объектами — закладки остаются верными
+        del out.pages[:]
+        out.pages.extend(pages)
+
+    if outline_items:
+        with out.open_outline() as outline:
+            outline.root.extend(outline_items)
+
+    out.save(
+        out_path,
+        compress_streams=True,
+        object_stream_mode=pikepdf.ObjectStreamMode.generate,
+    )
+
+
+def close_merge_output(output: dict) -> None:
+    """Закрывает итог и исходники (повторный вызов ничего не делает)."""
+    for pdf in output["sources"]:
+        pdf.close()
+    output["sources"] = []
+    output["pdf"].close()
+
+
 def merge_pdfs(pdf_paths: Sequence[Path], out_path: Path) -> Path | None:
     """
-    Объединяет несколько PDF в один.
+    Объединяет несколько PDF в один (pikepdf/qpdf).
+    Страницы не разбираются: объекты копируются ссылками на исходные файлы
+    и читаются один раз при записи итога. Закладки всех файлов сохраняются,
+    одинаковые шрифты и картинки из разных файлов пишутся один раз.
     out_path — полный путь к итоговому файлу.
     Возвращает out_path или None при ошибке.
     """
     if not pdf_paths:
         return None
 
+    output = open_merge_output()
     try:
-        merger = PdfMerger()
+        pages, outline_items = [], []
         for p in pdf_paths:
-            merger.append(str(p))
-        with open(out_path, "wb") as f:
-            merger.write(f)
-        merger.close()
+            file_pages, file_outline = append_to_merge_output(output, p)
+            pages.extend(file_pages)
+            outline_items.extend(file_outline)
+        save_merge_output(output, pages, outline_items, out_path)
     except Exception as e:
         logger.error(f"Merge PDFs error: {e}")
         return None
+    finally:
+        close_merge_output(output)
 
-    return out_path if out_path.exists() else None
\ No newline at end of file
+    return out_path if out_path.exists() else None
@@ -0,0 +1,84 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from settings import logger
+from services.converters.pdf.merge import (
+    append_to_merge_output,
+    close_merge_output,
+    open_merge_output,
+    save_merge_output,
+)
+
+
+def create_merge_session(merge_dir: Path) -> dict:
+    """
+    Новая сессия объединения в собственной папке внутри merge_dir
+    (tempfile.mkdtemp — сессии не затирают друг друга, даже у одного пользователя).
+    Каждый присланный файл сразу дописывается в растущий итог (open_merge_output),
+    при подтверждении остаётся только записать его.
+    {"dir": Path, "output": dict,
+     "files": [{"path", "name", "pages", "out_pages", "outline"}]}
+    """
+    merge_dir.mkdir(parents=True, exist_ok=True)
+    session_dir = Path(tempfile.mkdtemp(dir=merge_dir))
+    return {"dir": session_dir, "output": open_merge_output(), "files": []}
+
+
+def append_to_merge_session(session: dict, pdf_path: Path, name: str) -> dict | None:
+    """
+    Дописывает PDF (уже лежащий в папке сессии) в конец итога сессии.
+    Возвращает запись файла или None при ошибке.
+    """
+    try:
+        out_pages, outline = append_to_merge_output(session["output"], pdf_path)
+        if not out_pages:
+            raise ValueError("empty PDF")
+    except Exception as e:
+        logger.error(f"Merge session append error ({name}): {e}")
+        return None
+
+    entry = {
+        "path": pdf_path,
+        "name": name,
+        "pages": len(out_pages),
+        "out_pages": out_pages,
+        "outline": outline,
+    }
+    session["files"].append(entry)
+    return entry
+
+
+def reorder_merge_session(session: dict, order: list[int]) -> None:
+    """
+    Переставляет файлы сессии: order — индексы файлов (с 0) в новом порядке.
+    Файлы, которых нет в order, выпадают из итога. С диска они уходят
+    вместе с папкой сессии: их шрифты и картинки могут быть общими с оставшимися.
+    """
+    files = session["files"]
+    session["files"] = [files[i] for i in order]
+
+
+def finish_merge_session(session: dict, out_path: Path) -> Path | None:
+    """Записывает итог сессии в out_path и удаляет папку сессии."""
+    files = session["files"]
+    try:
+        save_merge_output(
+            session["output"],
+            [page for entry in files for page in entry["out_pages"]],
+            [item for entry in files for item in entry["outline"]],
+            out_path,
+        )
+    except Exception as e:
+        logger.error(f"Merge session finish error: {e}")
+        return None
+    finally:
+        discard_merge_session(session)
+
+    return out_path if out_path.exists() else None
+
+
+def discard_merge_session(session: dict) -> None:
+    """Закрывает итог сессии и удаляет её папку (только её)."""
+    close_merge_output(session["output"])
+    shutil.rmtree(session["dir"], ignore_errors=True)
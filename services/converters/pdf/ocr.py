@@ -1,45 +1,115 @@
 from pathlib import Path
-from io import BytesIO
+from typing import Iterator
 
 import fitz
-import pytesseract
-from PIL import Image
 
 from settings import FILES_DIR, logger
+from services.converters.pdf.ocr_engine import detect_ocr_lang, ocr_page
+from services.converters.pdf.page_analysis import (
+    BLANK_PAGE_KINDS,
+    OCR_PAGE_KINDS,
+    PAGE_BLANK,
+    classify_page,
+    choose_ocr_render,
+)
 
 
-def ocr_pdf_to_txt(pdf_path: Path, user_id: int, lang: str = "rus+eng") -> Path | None:
+# Сколько страниц в одной частичной выдаче для длинных документов
+OCR_PART_PAGES = 50
+
+
+def ocr_pdf_to_txt_parts(
+    pdf_path: Path,
+    txt_path: Path,
+    lang: str | None = None,
+    part_pages: int = OCR_PART_PAGES,
+    blank_pages: list[int] | None = None,
+) -> Iterator[tuple[Path, int, int, int]]:
     """
-    OCR для PDF: создаёт TXT-файл с распознанным текстом.
-    Возвращает путь к TXT или None при ошибке/пустом тексте.
+    Потоковый OCR для PDF: текст пишется в txt_path постранично.
+    Генератор отдаёт (path, first_page, last_page, total_pages):
+      - после каждых part_pages страниц — отдельный TXT с этим куском
+        (если документ длиннее part_pages; part_pages=0 — без кусков);
+      - в конце — сам txt_path (last_page == total_pages).
+    Страницы с текстовым слоем не распознаются — берётся встроенный текст,
+    пустые страницы пропускаются, OCR запускается только для растровых страниц.
+    lang=None — языки подбираются автоматически (detect_ocr_lang).
+    blank_pages — если передан, в него дописываются номера (с 1) пустых
+    и почти пустых страниц из той же классификации (для предложения удалить).
+    Если произошла ошибка или текста нет совсем — финального элемента нет,
+    txt_path удаляется.
     """
     try:
         pdf_doc = fitz.open(str(pdf_path))
     except Exception as e:
         logger.error(f"OCR PDF open error: {e}")
-        return None
+        return
 
-    all_text_parts: list[str] = []
+    total = len(pdf_doc)
+    use_parts = 0 < part_pages < total
+    part_chunks: list[str] = []
+    part_first = 1
+    has_text = False
 
     try:
-        for page_index, page in enumerate(pdf_doc, start=1):
-            pix = page.get_pixmap(dpi=300)
-            img_bytes = pix.tobytes("png")
-            img = Image.open(BytesIO(img_bytes))
-
-            text_page = pytesseract.image_to_string(
-                img,
-                lang=lang,
-            )
-            all_text_parts.append(text_page)
+        pages = [classify_page(page) for page in pdf_doc]
+        scan_numbers = [i for i, (kind, _) in enumerate(pages) if kind in OCR_PAGE_KINDS]
+        if lang is None:
+            lang = detect_ocr_lang(pdf_doc, scan_numbers)
+
+        with txt_path.open("w", encoding="utf-8") as full_file:
+            for page, (kind, text_page) in zip(pdf_doc, pages):
+                page_no = page.number + 1
+
+                if kind in OCR_PAGE_KINDS:
+                    dpi, _ = choose_ocr_render(page)
+                    text_page = ocr_page(page, lang=lang, dpi=dpi)["text"]
+
+                text_page = text_page.strip()
+                has_text = has_text or bool(text_page)
+                full_file.write(text_page + "\n\n")
+
+                if not use_parts:
+                    continue
+
+                part_chunks.append(text_page)
+                if len(part_chunks) == part_pages and page_no < total:
+                    part_path = FILES_DIR / f"{pdf_path.stem}_ocr_p{part_first}-{page_no}.txt"
+                    part_path.write_text("\n\n".join(part_chunks), encoding="utf-8")
+                    full_file.flush()
+                    yield part_path, part_first, page_no, total
+
+                    part_chunks = []
+                    part_first = page_no + 1
     except Exception as e:
         logger.error(f"OCR processing error: {e}")
-        return None
+        txt_path.unlink(missing_ok=True)
+        return
+    finally:
+        pdf_doc.close()
+
+    if blank_pages is not None:
+        blank_pages.extend(i + 1 for i, (kind, _) in enumerate(pages) if kind in BLANK_PAGE_KINDS)
 
-    full_text = "\n\n".join(all_text_parts).strip()
-    if not full_text:
-        return None
+    blank = sum(1 for kind, _ in pages if kind == PAGE_BLANK)
+    logger.info(
+        f"OCR PDF: {len(scan_numbers)} of {total} pages recognized, "
+        f"blank={blank}, lang={lang}"
+    )
+    if not has_text:
+        txt_path.unlink(missing_ok=True)
+        return
+    yield txt_path, 1, total, total
 
+
+def ocr_pdf_to_txt(pdf_path: Path, user_id: int, lang: str | None = None) -> Path | None:
+    """
+    OCR для PDF: создаёт TXT-файл с распознанным текстом (целиком, без кусков).
+    Возвращает путь к TXT или None при ошибке/пустом тексте.
+    """
     txt_path = FILES_DIR / (pdf_path.stem + "_ocr.txt")
-    txt_path.write_text(full_text, encoding="utf-8")
-    return txt_path
\ No newline at end of file
+
+    for path, _, last, total in ocr_pdf_to_txt_parts(pdf_path, txt_path, lang=lang, part_pages=0):
+        if last == total:
+            return path
+    return None
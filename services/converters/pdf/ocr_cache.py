@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import fitz
+
+from settings import OCR_CACHE_DIR, OCR_CACHE_MAX_BYTES, logger
+
+
+# Меняется при изменении формата записи или пайплайна распознавания
+CACHE_VERSION = "2"
+
+_lock = threading.Lock()
+_total_bytes: int | None = None  # считается лениво при первой записи
+
+
+def page_cache_key(page: fitz.Page, lang: str, dpi: int) -> str:
+    """
+    Ключ кэша OCR для страницы: хэш потока содержимого, сырых потоков
+    картинок и форм страницы, геометрии страницы + языки и DPI.
+    Одна и та же страница в другом файле (повторная отправка) даёт тот же ключ.
+    """
+    doc = page.parent
+    h = hashlib.sha256()
+    h.update(f"{CACHE_VERSION}|{lang}|{dpi}|{page.rotation}|{tuple(page.rect)}".encode())
+    h.update(page.read_contents())
+
+    xrefs = sorted(
+        {img[0] for img in page.get_images(full=True)}
+        | {form[0] for form in page.get_xobjects()}
+    )
+    for xref in xrefs:
+        if xref > 0 and doc.xref_is_stream(xref):
+            h.update(doc.xref_stream_raw(xref))
+
+    return h.hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return OCR_CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def get_cached_ocr(key: str) -> dict | None:
+    """Результат OCR из кэша или None. Попадание обновляет mtime (LRU)."""
+    path = _entry_path(key)
+    try:
+        result = json.loads(path.read_text(encoding="utf-8"))
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"OCR cache read error: {e}")
+        return None
+    return result
+
+
+def put_cached_ocr(key: str, result: dict) -> None:
+    """Сохраняет результат OCR страницы; при превышении лимита вытесняет старые записи."""
+    global _total_bytes
+
+    path = _entry_path(key)
+    data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # запись с тем же ключом заменяет старую — её размер не должен считаться дважды
+        old_size = path.stat().st_size if path.exists() else 0
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+    except Exception as e:
+        logger.error(f"OCR cache write error: {e}")
+        return
+
+    with _lock:
+        if _total_bytes is None:
+            _total_bytes = sum(p.stat().st_size for p in OCR_CACHE_DIR.glob("*/*.json"))
+        else:
+            _total_bytes += len(data) - old_size
+
+        if _total_bytes > OCR_CACHE_MAX_BYTES:
+            _total_bytes = _evict(int(OCR_CACHE_MAX_BYTES * 0.9))
+
+
+def _evict(target_bytes: int) -> int:
+    """Удаляет самые давно использованные записи, пока объём не станет <= target_bytes."""
+    entries = []
+    for p in OCR_CACHE_DIR.glob("*/*.json"):
+        try:
+            st = p.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, p in entries:
+        if total <= target_bytes:
+            break
+        p.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+
+    logger.info(f"OCR cache eviction: removed={removed}, size={total}")
+    return total
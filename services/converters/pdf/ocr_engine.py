@@ -0,0 +1,249 @@
+import threading
+
+import fitz
+import numpy as np
+from tesserocr import PyTessBaseAPI
+
+from settings import TESSDATA_DIR, OCR_LANGUAGES, logger
+from services.converters.pdf.ocr_cache import get_cached_ocr, page_cache_key, put_cached_ocr
+from services.converters.pdf.preprocess import map_words_back, preprocess_for_ocr
+
+
+OCR_DPI = 300
+
+# Определение скрипта (Tesseract OSD) на нескольких страницах-образцах
+OSD_LANG = "osd"
+OSD_DPI = 150
+OSD_SAMPLE_PAGES = 2
+OSD_MIN_SCRIPT_CONF = 1.0
+
+# Скрипт по OSD -> языковые модели, которые его покрывают
+SCRIPT_LANGS = {
+    "Latin": ("eng", "deu", "fra", "spa", "ita", "por", "nld", "pol", "ces", "tur"),
+    "Cyrillic": ("rus", "ukr", "bel", "bul", "srp", "kaz"),
+    "Greek": ("ell",),
+    "Arabic": ("ara", "fas"),
+    "Hebrew": ("heb",),
+    "Han": ("chi_sim", "chi_tra"),
+    "Japanese": ("jpn",),
+    "Hangul": ("kor",),
+    "Devanagari": ("hin",),
+    "Georgian": ("kat",),
+    "Armenian": ("hye",),
+    "Thai": ("tha",),
+}
+
+# Шрифт невидимого текстового слоя (есть латиница и кириллица)
+TEXT_LAYER_FONT = fitz.Font("helv")
+
+# Движки живут в своём потоке: PyTessBaseAPI не потокобезопасен
+_local = threading.local()
+
+
+def get_ocr_engine(lang: str) -> PyTessBaseAPI:
+    """
+    Возвращает долгоживущий движок tesseract (C API) для языков lang.
+    Модели traineddata загружаются один раз на поток и языковой набор,
+    дальше страницы подаются в уже инициализированный движок.
+    """
+    engines = getattr(_local, "engines", None)
+    if engines is None:
+        engines = _local.engines = {}
+
+    api = engines.get(lang)
+    if api is None:
+        logger.info(f"Loading tesseract engine: lang={lang}")
+        api = PyTessBaseAPI(path=TESSDATA_DIR, lang=lang)
+        engines[lang] = api
+    return api
+
+
+def _set_pixmap(api: PyTessBaseAPI, pix: fitz.Pixmap, dpi: int) -> None:
+    """Отдаёт движку сырые сэмплы pixmap, без PNG и временных файлов."""
+    if pix.alpha or pix.n not in (1, 3):
+        pix = fitz.Pixmap(fitz.csRGB, pix, 0)
+
+    api.SetImageBytes(pix.samples, pix.width, pix.height, pix.n, pix.stride)
+    api.SetSourceResolution(dpi)
+
+
+def detect_ocr_lang(pdf_doc: fitz.Document, page_numbers: list[int]) -> str:
+    """
+    Подбирает минимальный набор языков OCR для документа.
+    На первых OSD_SAMPLE_PAGES страницах из page_numbers tesseract OSD
+    определяет скрипт (Latin, Cyrillic, ...), из OCR_LANGUAGES остаются
+    только модели этого скрипта. Для кириллицы добавляется eng —
+    латиница в таких документах встречается постоянно.
+    Если определить не удалось — возвращаются все OCR_LANGUAGES.
+    """
+    fallback = "+".join(OCR_LANGUAGES)
+    if len(OCR_LANGUAGES) <= 1 or not page_numbers:
+        return fallback
+
+    scripts: set[str] = set()
+    api = None
+    try:
+        # модель osd может отсутствовать — это та же ошибка определения
+        api = get_ocr_engine(OSD_LANG)
+        for number in page_numbers[:OSD_SAMPLE_PAGES]:
+            pix = pdf_doc[number].get_pixmap(dpi=OSD_DPI, colorspace=fitz.csGRAY)
+            _set_pixmap(api, pix, OSD_DPI)
+            osd = api.DetectOrientationScript()
+            if osd and osd["script_conf"] >= OSD_MIN_SCRIPT_CONF:
+                scripts.add(osd["script_name"])
+    except Exception as e:
+        logger.error(f"OCR script detection error: {e}")
+        return fallback
+    finally:
+        if api is not None:
+            api.Clear()
+
+    wanted: set[str] = set()
+    for script in scripts:
+        wanted.update(SCRIPT_LANGS.get(script, ()))
+    if "Cyrillic" in scripts:
+        wanted.add("eng")
+
+    langs = [lang for lang in OCR_LANGUAGES if lang in wanted]
+    if not langs:
+        return fallback
+
+    lang = "+".join(langs)
+    logger.info(f"OCR script detection: scripts={sorted(scripts)}, lang={lang}")
+    return lang
+
+
+def _parse_tsv_words(tsv: str) -> list[tuple[int, int, int, int, str]]:
+    """
+    Из TSV tesseract берём только слова (level=5):
+    [(x0, y0, x1, y1, word), ...] в пикселях изображения.
+    """
+    words: list[tuple[int, int, int, int, str]] = []
+    for line in tsv.splitlines():
+        cols = line.split("\t")
+        if len(cols) < 12 or cols[0] != "5":
+            continue
+        word = cols[11].strip()
+        if not word:
+            continue
+        left, top, width, height = (int(v) for v in cols[6:10])
+        words.append((left, top, left + width, top + height, word))
+    return words
+
+
+def _recognize(api: PyTessBaseAPI) -> dict:
+    """Текст и рамки слов из одного прохода распознавания уже заданной картинки."""
+    try:
+        text = api.GetUTF8Text()
+        # TSV берётся из уже выполненного распознавания, повторного прохода нет
+        words = _parse_tsv_words(api.GetTSVText(0))
+    finally:
+        api.Clear()
+    return {"text": text, "words": words}
+
+
+def ocr_pixmap(pix: fitz.Pixmap, lang: str, dpi: int = OCR_DPI) -> dict:
+    """
+    Распознаёт pixmap резидентным движком.
+
+    Возвращает {"text": str, "words": [(x0, y0, x1, y1, word), ...]},
+    координаты слов — в пикселях pixmap.
+    """
+    api = get_ocr_engine(lang)
+    _set_pixmap(api, pix, dpi)
+    return _recognize(api)
+
+
+def ocr_array(image: np.ndarray, lang: str, dpi: int = OCR_DPI) -> dict:
+    """То же, что ocr_pixmap, для одноканальной картинки HxW uint8 (numpy)."""
+    height, width = image.shape
+    api = get_ocr_engine(lang)
+    api.SetImageBytes(image.tobytes(), width, height, 1, width)
+    api.SetSourceResolution(dpi)
+    return _recognize(api)
+
+
+def ocr_page(
+    page: fitz.Page,
+    lang: str,
+    dpi: int,
+    pix: fitz.Pixmap | None = None,
+) -> dict:
+    """
+    OCR страницы через общий дисковый кэш (см. ocr_cache).
+    При промахе страница рендерится в оттенках серого с нужным DPI
+    (или берётся готовый pix того же DPI), проходит preprocess_for_ocr
+    и распознаётся. Формат результата — как у ocr_pixmap, рамки слов —
+    в пикселях исходного рендера страницы.
+    """
+    key = page_cache_key(page, lang, dpi)
+    cached = get_cached_ocr(key)
+    if cached is not None:
+        return cached
+
+    if pix is None:
+        pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+    elif pix.n != 1 or pix.alpha:
+        # tesseract всё равно работает с яркостью; серый вход делает
+        # результат одинаковым для обоих режимов OCR и общим в кэше
+        pix = fitz.Pixmap(fitz.csGRAY, pix)
+
+    gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+    image, transform = preprocess_for_ocr(gray)
+    result = ocr_array(image, lang=lang, dpi=dpi)
+    result["words"] = map_words_back(result["words"], transform)
+
+    put_cached_ocr(key, result)
+    return result
+
+
+def overlay_text_matrix(page: fitz.Page) -> fitz.Matrix:
+    """
+    Матрица для TextWriter.write_text, чтобы слова с координатами видимой
+    страницы (как на рендере) легли на исходную страницу с учётом /Rotate,
+    CropBox и MediaBox, не сдвинутой в (0, 0).
+    """
+    rotation = page.rotation
+    page.set_rotation(0)
+    ctm = page.transformation_matrix
+    page.set_rotation(rotation)
+    # PDF -> видимая страница (сверху вниз)
+    ctm = ctm * page.rotation_matrix
+
+    rect = page.rect
+    mediabox = page.mediabox
+    cropbox_pos = page.cropbox_position
+    # write_text сам добавляет этот сдвиг перед нашей матрицей — компенсируем
+    delta = rect.height - rect.width if rotation in (90, 270) else 0
+    shift = fitz.Matrix(1, 0, 0, 1, cropbox_pos.x, cropbox_pos.y + mediabox.y0 - delta)
+
+    return fitz.Matrix(1, 0, 0, -1, 0, rect.height) * ~ctm * ~shift
+
+
+def insert_text_layer(
+    page: fitz.Page,
+    words: list,
+    scale: float,
+    matrix: fitz.Matrix | None = None,
+) -> None:
+    """
+    Вписывает невидимый (render_mode=3) текст слов в страницу PDF.
+    scale переводит пиксели OCR в пункты страницы (72 / dpi).
+    Для исходных страниц (а не новых) нужен matrix=overlay_text_matrix(page).
+    """
+    if not words:
+        return
+
+    writer = fitz.TextWriter(page.rect)
+    for x0, y0, x1, y1, word in words:
+        rect = fitz.Rect(x0, y0, x1, y1) * scale
+        unit_width = TEXT_LAYER_FONT.text_length(word, fontsize=1)
+        if unit_width <= 0 or rect.is_empty:
+            continue
+
+        # подгоняем кегль под ширину слова, но не выше самой рамки
+        fontsize = min(rect.width / unit_width, rect.height)
+        baseline = fitz.Point(rect.x0, rect.y1 + TEXT_LAYER_FONT.descender * fontsize)
+        writer.append(baseline, word, font=TEXT_LAYER_FONT, fontsize=fontsize)
+
+    writer.write_text(page, render_mode=3, matrix=matrix)
@@ -0,0 +1,197 @@
+import fitz
+import numpy as np
+
+
+# Страница считается сканом, если картинки закрывают большую часть листа,
+# а собственного текста почти нет (колонтитул/штамп поверх скана не в счёт)
+SCAN_IMAGE_COVERAGE = 0.5
+SCAN_MAX_TEXT_CHARS = 200
+
+# Подбор разрешения для OCR: tesseract лучше всего работает, когда строка
+# текста занимает несколько десятков пикселей; больше — только память и время
+OCR_MIN_DPI = 150
+OCR_MAX_DPI = 300
+OCR_MAX_PIXELS = 9_000_000  # ~A4 при 300 DPI
+TARGET_LINE_PX = 48
+PREVIEW_DPI = 72
+
+# Пустая страница: рендер в BLANK_DPI без полей, «чернила» — пиксели заметно
+# темнее фона. Пустая — ни одного пятна чернил крупнее пыли (OCR не нужен);
+# почти пустая — чернил меньше BLANK_MAX_INK (строка подписи, одна строка итога):
+# её распознаём, но предлагаем удалить
+BLANK_DPI = 100
+BLANK_MARGIN = 0.05
+BLANK_INK_DELTA = 80
+BLANK_MAX_INK = 0.001
+BLANK_MIN_MARK_PX = 8
+
+PAGE_TEXT = "text"
+PAGE_SCAN = "scan"
+PAGE_BLANK = "blank"
+PAGE_NEAR_BLANK = "near_blank"
+
+# Какие страницы распознаются OCR и какие предлагаются к удалению как пустые
+OCR_PAGE_KINDS = (PAGE_SCAN, PAGE_NEAR_BLANK)
+BLANK_PAGE_KINDS = (PAGE_BLANK, PAGE_NEAR_BLANK)
+
+
+def image_coverage(page: fitz.Page) -> float:
+    """
+    Доля площади страницы, закрытая изображениями (0..1).
+    Пересечения картинок не вычитаются — для классификации этого хватает.
+    """
+    page_area = abs(page.rect)
+    if not page_area:
+        return 0.0
+
+    covered = 0.0
+    for info in page.get_image_info():
+        bbox = fitz.Rect(info["bbox"]) & page.rect
+        if not bbox.is_empty:
+            covered += abs(bbox)
+    return min(covered / page_area, 1.0)
+
+
+def _has_ink_marks(ink: np.ndarray) -> bool:
+    """
+    Есть ли в маске чернил связное пятно (8-связность) из BLANK_MIN_MARK_PX
+    пикселей и больше: буква мелкого текста — уже такое пятно, пыль и шум
+    скана — нет. Маска почти пустая, поэтому обход в Python дешёвый.
+    """
+    remaining = set(zip(*(axis.tolist() for axis in np.nonzero(ink))))
+    while remaining:
+        stack = [remaining.pop()]
+        size = 0
+        while stack:
+            y, x = stack.pop()
+            size += 1
+            if size >= BLANK_MIN_MARK_PX:
+                return True
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    neighbour = (y + dy, x + dx)
+                    if neighbour in remaining:
+                        remaining.remove(neighbour)
+                        stack.append(neighbour)
+    return False
+
+
+def blank_kind(page: fitz.Page) -> str | None:
+    """
+    Пустая или почти пустая страница (разделитель, оборот листа).
+    Смотрим рендер в BLANK_DPI без полей: «чернилами» считаются пиксели
+    заметно темнее фона (просвечивающий оборот светлее порога).
+    Возвращает PAGE_BLANK (чернил нет совсем), PAGE_NEAR_BLANK
+    (чернил меньше BLANK_MAX_INK) или None.
+    """
+    pix = page.get_pixmap(dpi=BLANK_DPI, colorspace=fitz.csGRAY)
+    gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+
+    mh = int(pix.height * BLANK_MARGIN)
+    mw = int(pix.width * BLANK_MARGIN)
+    inner = gray[mh:pix.height - mh, mw:pix.width - mw]
+    if inner.size == 0:
+        return PAGE_BLANK
+
+    background = float(np.median(inner))
+    ink = inner < background - BLANK_INK_DELTA
+    if float(ink.mean()) >= BLANK_MAX_INK:
+        return None
+    return PAGE_NEAR_BLANK if _has_ink_marks(ink) else PAGE_BLANK
+
+
+def classify_page(page: fitz.Page) -> tuple[str, str]:
+    """
+    Классифицирует страницу по текстовому слою и покрытию картинками.
+    Возвращает (kind, text):
+      - (PAGE_TEXT, встроенный текст) — OCR не нужен,
+      - (PAGE_BLANK, "") — пустая страница, ни рендер, ни OCR не нужны,
+      - (PAGE_NEAR_BLANK, "") — почти пустая растровая страница: нужен OCR,
+        но её можно предложить удалить,
+      - (PAGE_SCAN, "") — растровая страница, нужен OCR.
+    """
+    text = page.get_text("text")
+    chars = sum(1 for ch in text if not ch.isspace())
+
+    if chars == 0:
+        return blank_kind(page) or PAGE_SCAN, ""
+
+    if chars < SCAN_MAX_TEXT_CHARS and image_coverage(page) >= SCAN_IMAGE_COVERAGE:
+        return PAGE_SCAN, ""
+
+    return PAGE_TEXT, text
+
+
+def _preview_array(page: fitz.Page) -> np.ndarray:
+    """Дешёвый RGB-рендер страницы в разрешении PREVIEW_DPI как массив HxWx3."""
+    pix = page.get_pixmap(dpi=PREVIEW_DPI, colorspace=fitz.csRGB, alpha=False)
+    return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, 3)
+
+
+def _line_height_pt(gray: np.ndarray) -> float | None:
+    """
+    Оценка высоты строки текста (в пунктах) по горизонтальному профилю:
+    подряд идущие строки пикселей с «чернилами» — это строки текста,
+    берём медиану их высот. None, если строк не нашлось.
+    """
+    low, high = np.percentile(gray, (5, 95))
+    if high - low < 32:
+        return None
+
+    ink = gray < (low + high) / 2
+    rows = ink.mean(axis=1) > 0.005
+
+    # длины серий True в профиле строк
+    edges = np.diff(np.concatenate(([0], rows.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    heights = ends - starts
+    heights = heights[(heights >= 3) & (heights <= gray.shape[0] // 10)]
+    if heights.size == 0:
+        return None
+
+    return float(np.median(heights)) * 72 / PREVIEW_DPI
+
+
+def _native_image_dpi(page: fitz.Page) -> float | None:
+    """Собственное разрешение самой крупной картинки страницы (для сканов)."""
+    best = None
+    best_area = 0.0
+    for info in page.get_image_info():
+        bbox = fitz.Rect(info["bbox"])
+        if bbox.is_empty or abs(bbox) <= best_area:
+            continue
+        best_area = abs(bbox)
+        best = max(info["width"] / bbox.width, info["height"] / bbox.height) * 72
+    return best
+
+
+def choose_ocr_render(page: fitz.Page) -> tuple[int, bool]:
+    """
+    Подбирает параметры рендера страницы под OCR.
+    Возвращает (dpi, gray):
+      - dpi — чтобы строка текста была ~TARGET_LINE_PX пикселей, но не выше
+        родного разрешения скана и не больше OCR_MAX_PIXELS на страницу;
+      - gray — True, если цвет на странице ничего не несёт.
+    """
+    preview = _preview_array(page)
+    gray = preview.mean(axis=2)
+
+    dpi = float(OCR_MAX_DPI)
+
+    line_pt = _line_height_pt(gray)
+    if line_pt:
+        dpi = min(dpi, TARGET_LINE_PX * 72 / line_pt)
+
+    native_dpi = _native_image_dpi(page)
+    if native_dpi:
+        dpi = min(dpi, native_dpi)
+
+    page_px_at_72 = page.rect.width * page.rect.height
+    if page_px_at_72 > 0:
+        dpi = min(dpi, 72 * (OCR_MAX_PIXELS / page_px_at_72) ** 0.5)
+
+    chroma = preview.max(axis=2).astype(np.int16) - preview.min(axis=2)
+    colored = float((chroma > 40).mean())
+
+    return max(OCR_MIN_DPI, int(dpi)), colored < 0.01
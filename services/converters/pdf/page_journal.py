@@ -0,0 +1,150 @@
+import io
+from array import array
+from pathlib import Path
+
+import fitz
+from PIL import Image, ImageDraw
+
+from settings import logger
+from services.converters.pdf.doc_cache import get_document
+from services.converters.pdf.rotate import rotate_pages_incremental
+from services.converters.pdf.split import extract_pages
+
+
+# Превью журнала: миниатюры первых страниц текущего порядка сеткой в одной картинке
+PREVIEW_MAX_PAGES = 12
+PREVIEW_COLUMNS = 4
+PREVIEW_THUMB_PX = 240
+PREVIEW_LABEL_PX = 20
+PREVIEW_GAP_PX = 8
+
+
+def new_journal(num_pages: int) -> dict:
+    """
+    Журнал правок редактора страниц — сам PDF не трогается до экспорта:
+      order    — array('I'): индексы исходных страниц (с 0) в текущем порядке,
+                 удалённых страниц в нём нет;
+      rotation — array('H'): дополнительный поворот каждой исходной страницы
+                 (0/90/180/270, по часовой стрелке).
+    """
+    return {
+        "order": array("I", range(num_pages)),
+        "rotation": array("H", bytes(2 * num_pages)),
+    }
+
+
+def journal_page_count(journal: dict) -> int:
+    return len(journal["order"])
+
+
+def journal_rotate(journal: dict, pages: list[int], angle: int) -> None:
+    """Поворот страниц (номера с 1 в текущем порядке) на angle, кратный 90."""
+    order = journal["order"]
+    rotation = journal["rotation"]
+    for number in pages:
+        src = order[number - 1]
+        rotation[src] = (rotation[src] + angle) % 360
+
+
+def journal_delete(journal: dict, pages: list[int]) -> int:
+    """Удаляет страницы (номера с 1 в текущем порядке). Возвращает, сколько осталось."""
+    drop = set(pages)
+    journal["order"] = array(
+        "I", (src for number, src in enumerate(journal["order"], start=1) if number not in drop)
+    )
+    return len(journal["order"])
+
+
+def journal_reorder(journal: dict, permutation: array) -> None:
+    """
+    Новый порядок страниц: permutation — индексы (с 0) текущего порядка
+    (см. parse_page_order). Меняется только массив order.
+    """
+    order = journal["order"]
+    journal["order"] = array("I", (order[i] for i in permutation))
+
+
+def apply_journal(
+    pdf_path: Path,
+    journal: dict,
+    out_path: Path,
+    pages: list[int] | None = None,
+) -> Path | None:
+    """
+    Применяет журнал к исходному PDF и пишет результат в out_path.
+    Если страницы не удалялись и не переставлялись — только повороты
+    через /Rotate с дописыванием в копию файла (rotate_pages_incremental).
+    Иначе — один проход extract_pages (pikepdf): страницы в порядке журнала
+    с поворотами, из общих /Resources берётся только то, что они используют.
+    pages — только эти страницы (номера с 1 в текущем порядке), например
+    для извлечения; None — весь документ.
+    Возвращает out_path или None при ошибке.
+    """
+    order = journal["order"]
+    rotation = journal["rotation"]
+    sources = [order[n - 1] for n in pages] if pages else list(order)
+    if not sources:
+        return None
+
+    if sources == list(range(len(rotation))):
+        # порядок и состав страниц не менялись — только повороты:
+        # копия файла + дописанные словари страниц вместо пересборки
+        rotations = {src: angle for src, angle in enumerate(rotation) if angle}
+        return rotate_pages_incremental(pdf_path, rotations, out_path)
+
+    return extract_pages(
+        pdf_path,
+        [src + 1 for src in sources],
+        out_path,
+        rotations={src + 1: rotation[src] for src in sources if rotation[src]},
+    )
+
+
+def render_journal_preview(pdf_path: Path, journal: dict) -> bytes | None:
+    """
+    PNG-превью документа с учётом журнала: первые PREVIEW_MAX_PAGES страниц
+    текущего порядка миниатюрами (с поворотом) и их номера.
+    Рендерятся только эти страницы документа сессии (get_document),
+    PDF не пересобирается и не перечитывается.
+    """
+    order = journal["order"]
+    rotation = journal["rotation"]
+    shown = list(order[:PREVIEW_MAX_PAGES])
+    if not shown:
+        return None
+
+    try:
+        thumbs = []
+        pdf_doc = get_document(pdf_path)
+        for src in shown:
+            page = pdf_doc[src]
+            rect = page.rect
+            zoom = PREVIEW_THUMB_PX / max(rect.width, rect.height)
+            # поворот журнала поверх собственного /Rotate страницы
+            matrix = fitz.Matrix(zoom, zoom).prerotate(rotation[src])
+            pix = page.get_pixmap(matrix=matrix, colorspace=fitz.csRGB, alpha=False)
+            thumbs.append(Image.frombytes("RGB", (pix.width, pix.height), pix.samples))
+    except Exception as e:
+        logger.error(f"Page journal preview error: {e}")
+        return None
+
+    columns = min(PREVIEW_COLUMNS, len(thumbs))
+    rows = (len(thumbs) + columns - 1) // columns
+    cell_w = PREVIEW_THUMB_PX + PREVIEW_GAP_PX
+    cell_h = PREVIEW_THUMB_PX + PREVIEW_LABEL_PX + PREVIEW_GAP_PX
+
+    sheet = Image.new("RGB", (columns * cell_w + PREVIEW_GAP_PX, rows * cell_h + PREVIEW_GAP_PX), "#d0d0d0")
+    draw = ImageDraw.Draw(sheet)
+    for i, thumb in enumerate(thumbs):
+        x = PREVIEW_GAP_PX + (i % columns) * cell_w
+        y = PREVIEW_GAP_PX + (i // columns) * cell_h
+        # миниатюра по центру ячейки, номер страницы под ней
+        sheet.paste(
+            thumb,
+            (x + (PREVIEW_THUMB_PX - thumb.width) // 2, y + (PREVIEW_THUMB_PX - thumb.height) // 2),
+        )
+        draw.text((x + PREVIEW_THUMB_PX // 2, y + PREVIEW_THUMB_PX + 4), str(i + 1), fill="black", anchor="mt")
+
+    buf = io.BytesIO()
+    sheet.save(buf, "PNG", optimize=True)
+    return buf.getvalue()
@@ -1,3 +1,6 @@
+from array import array
+
+
 def parse_page_range(range_str: str, max_pages: int) -> list[int]:
     """
     '1-3,5,7-9' → [1,2,3,5,7,8,9]
@@ -27,4 +30,38 @@ def parse_page_range(range_str: str, max_pages: int) -> list[int]:
                 continue
             if 1 <= p <= max_pages:
                 pages.add(p)
-    return sorted(pages)
\ No newline at end of file
+    return sorted(pages)
+
+
+def parse_page_order(order_str: str, max_pages: int) -> array | None:
+    """
+    '3,1,2,5-10,4' → array('I', [2, 0, 1, 4, 5, ..., 9, 3]) — новый порядок
+    страниц (индексы с 0). Диапазон '10-5' идёт в обратном порядке.
+    Нужна полная перестановка: каждая страница 1..max_pages ровно один раз,
+    иначе (пропуски, повторы, выход за пределы, мусор) — None.
+    """
+    order = array("I")
+    seen = bytearray(max_pages)
+
+    for part in order_str.replace(" ", "").split(","):
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                start_s, end_s = part.split("-", 1)
+                start, end = int(start_s), int(end_s)
+            else:
+                start = end = int(part)
+        except ValueError:
+            return None
+
+        step = 1 if end >= start else -1
+        for p in range(start, end + step, step):
+            if not 1 <= p <= max_pages or seen[p - 1]:
+                return None
+            seen[p - 1] = 1
+            order.append(p - 1)
+
+    if len(order) != max_pages:
+        return None
+    return order
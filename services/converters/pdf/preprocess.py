@@ -0,0 +1,167 @@
+import math
+
+import numpy as np
+from PIL import Image
+
+
+# Тёмные поля сканера: строки/столбцы у края со средней яркостью ниже порога
+BORDER_DARK_LEVEL = 80
+BORDER_MAX_SHARE = 0.1
+
+# Поиск перекоса: перебор углов в градусах на уменьшенной копии
+MAX_SKEW_DEG = 5.0
+SKEW_STEP_DEG = 0.2
+MIN_SKEW_DEG = 0.3
+SKEW_SAMPLE_WIDTH = 1000
+SKEW_MAX_POINTS = 100_000
+
+# Адаптивная бинаризация (Sauvola по блокам + сглаживание 3×3 блока)
+BINARIZE_BLOCK = 32
+SAUVOLA_K = 0.2
+SAUVOLA_R = 128.0
+
+
+def _crop_borders(gray: np.ndarray) -> tuple[np.ndarray, int, int]:
+    """Срезает тёмные поля по краям. Возвращает (картинка, сдвиг x, сдвиг y)."""
+    h, w = gray.shape
+
+    def dark_run(means: np.ndarray, limit: int) -> int:
+        light = np.flatnonzero(means[:limit] >= BORDER_DARK_LEVEL)
+        return int(light[0]) if light.size else limit
+
+    rows = gray.mean(axis=1)
+    cols = gray.mean(axis=0)
+    max_h = int(h * BORDER_MAX_SHARE)
+    max_w = int(w * BORDER_MAX_SHARE)
+
+    top = dark_run(rows, max_h)
+    bottom = h - dark_run(rows[::-1], max_h)
+    left = dark_run(cols, max_w)
+    right = w - dark_run(cols[::-1], max_w)
+
+    return gray[top:bottom, left:right], left, top
+
+
+def _estimate_skew(gray: np.ndarray) -> float:
+    """
+    Угол перекоса строк в градусах (0, если текста мало).
+    Для каждого угла-кандидата точки «чернил» проецируются на ось,
+    перпендикулярную строкам; лучший угол даёт самую «пиковую» гистограмму.
+    """
+    step = max(1, gray.shape[1] // SKEW_SAMPLE_WIDTH)
+    small = gray[::step, ::step]
+
+    low, high = np.percentile(small, (5, 95))
+    if high - low < 32:
+        return 0.0
+
+    ys, xs = np.nonzero(small < (low + high) / 2)
+    if ys.size < 500:
+        return 0.0
+    if ys.size > SKEW_MAX_POINTS:
+        every = ys.size // SKEW_MAX_POINTS + 1
+        ys, xs = ys[::every], xs[::every]
+
+    ys = ys.astype(np.float32)
+    xs = xs.astype(np.float32)
+
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-MAX_SKEW_DEG, MAX_SKEW_DEG + SKEW_STEP_DEG / 2, SKEW_STEP_DEG):
+        rad = math.radians(angle)
+        proj = ys * math.cos(rad) - xs * math.sin(rad)
+        hist = np.bincount((proj - proj.min()).astype(np.int32))
+        score = float(np.dot(hist, hist))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+
+    return best_angle
+
+
+def _box3(a: np.ndarray) -> np.ndarray:
+    """Среднее по окрестности 3×3 (края — повтором)."""
+    p = np.pad(a, 1, mode="edge")
+    h, w = a.shape
+    return sum(p[dy:dy + h, dx:dx + w] for dy in range(3) for dx in range(3)) / 9
+
+
+def _binarize(gray: np.ndarray) -> np.ndarray:
+    """Адаптивная бинаризация Sauvola: порог считается по блокам, не по пикселям."""
+    h, w = gray.shape
+    b = BINARIZE_BLOCK
+    hb, wb = -(-h // b), -(-w // b)
+
+    padded = np.pad(gray, ((0, hb * b - h), (0, wb * b - w)), mode="edge").astype(np.float32)
+    blocks = padded.reshape(hb, b, wb, b)
+    mean = _box3(blocks.mean(axis=(1, 3)))
+    sq_mean = _box3(np.square(blocks).mean(axis=(1, 3)))
+    std = np.sqrt(np.maximum(sq_mean - mean * mean, 0))
+
+    threshold = mean * (1 + SAUVOLA_K * (std / SAUVOLA_R - 1))
+    threshold = np.repeat(np.repeat(threshold, b, axis=0), b, axis=1)[:h, :w]
+    return np.where(gray > threshold, 255, 0).astype(np.uint8)
+
+
+def _denoise(binary: np.ndarray) -> np.ndarray:
+    """Убирает одиночные чёрные точки (не больше одного чёрного соседа из 8)."""
+    ink = (binary == 0).astype(np.uint8)
+    p = np.pad(ink, 1)
+    h, w = ink.shape
+    neighbours = sum(
+        p[dy:dy + h, dx:dx + w]
+        for dy in range(3)
+        for dx in range(3)
+        if (dy, dx) != (1, 1)
+    )
+    binary = binary.copy()
+    binary[(ink == 1) & (neighbours <= 1)] = 255
+    return binary
+
+
+def preprocess_for_ocr(gray: np.ndarray) -> tuple[np.ndarray, dict]:
+    """
+    Подготовка серого изображения страницы (HxW uint8) к OCR:
+    обрезка тёмных полей -> выравнивание перекоса -> адаптивная
+    бинаризация -> удаление шума.
+    Возвращает (чёрно-белая картинка 0/255, transform для map_words_back).
+    """
+    cropped, off_x, off_y = _crop_borders(gray)
+
+    angle = _estimate_skew(cropped)
+    if abs(angle) >= MIN_SKEW_DEG:
+        # поворот против часовой на angle выравнивает строки
+        rotated = Image.fromarray(cropped).rotate(
+            angle, resample=Image.BILINEAR, fillcolor=255
+        )
+        cropped = np.asarray(rotated)
+    else:
+        angle = 0.0
+
+    binary = _denoise(_binarize(cropped))
+
+    h, w = binary.shape
+    transform = {"angle": angle, "offset": (off_x, off_y), "center": (w / 2, h / 2)}
+    return np.ascontiguousarray(binary), transform
+
+
+def map_words_back(words: list, transform: dict) -> list:
+    """
+    Переводит рамки слов из координат подготовленной картинки
+    обратно в координаты исходного изображения страницы.
+    """
+    angle = transform["angle"]
+    off_x, off_y = transform["offset"]
+    cx, cy = transform["center"]
+    cos_a = math.cos(math.radians(angle))
+    sin_a = math.sin(math.radians(angle))
+
+    mapped = []
+    for x0, y0, x1, y1, word in words:
+        half_w, half_h = (x1 - x0) / 2, (y1 - y0) / 2
+        mx, my = (x0 + x1) / 2 - cx, (y0 + y1) / 2 - cy
+        # обратный поворот центра рамки; размер рамки сохраняем
+        ox = cx + mx * cos_a - my * sin_a + off_x
+        oy = cy + mx * sin_a + my * cos_a + off_y
+        mapped.append(
+            (round(ox - half_w), round(oy - half_h), round(ox + half_w), round(oy + half_h), word)
+        )
+    return mapped
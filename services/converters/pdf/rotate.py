@@ -1,3 +1,11 @@
+import shutil
+from pathlib import Path
+
+import fitz
+
+from settings import logger
+
+
 def rotate_page_inplace(page, angle: int) -> None:
     """
     Поворачивает страницу PyPDF2 на указанный угол (кратный 90).
@@ -22,4 +30,34 @@ def rotate_page_inplace(page, angle: int) -> None:
         elif angle == 270:
             page.rotateCounterClockwise(90)
     except Exception as e:
-        _logger.error(f"Page rotate fallback error: {e}")
\ No newline at end of file
+        _logger.error(f"Page rotate fallback error: {e}")
+
+
+def rotate_pages_incremental(pdf_path: Path, rotations: dict[int, int], out_path: Path) -> Path | None:
+    """
+    Поворот без пересборки документа: поворот — это только /Rotate в словаре
+    страницы. out_path — копия исходника, в конец которой дописывается
+    incremental update с изменёнными словарями страниц (несколько КБ),
+    остальные объекты файла не читаются и не переписываются.
+    rotations: индекс страницы (с 0) -> дополнительный угол по часовой, кратный 90.
+    Возвращает out_path или None при ошибке.
+    """
+    try:
+        shutil.copyfile(pdf_path, out_path)
+        with fitz.open(str(out_path)) as pdf_doc:
+            for index, angle in rotations.items():
+                page = pdf_doc[index]
+                page.set_rotation((page.rotation + angle) % 360)
+
+            if pdf_doc.can_save_incrementally():
+                pdf_doc.saveIncr()
+            else:
+                # битый xref (файл чинился при открытии) — только полная запись
+                tmp_path = out_path.with_name(f"{out_path.name}.tmp")
+                pdf_doc.save(str(tmp_path), garbage=3, deflate=True)
+                tmp_path.replace(out_path)
+    except Exception as e:
+        logger.error(f"Incremental rotate error: {e}")
+        return None
+
+    return out_path
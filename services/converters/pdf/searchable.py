@@ -1,17 +1,141 @@
+import shutil
+import tempfile
+from itertools import groupby
 from pathlib import Path
-from io import BytesIO
 
 import fitz
-import pytesseract
-from PIL import Image
-from PyPDF2 import PdfMerger, PdfReader
 
-from settings import FILES_DIR, logger
+from settings import FILES_DIR, TMP_DIR, logger
+from services.converters.pdf.ocr_engine import (
+    detect_ocr_lang,
+    ocr_page,
+    insert_text_layer,
+    overlay_text_matrix,
+)
+from services.converters.pdf.page_analysis import OCR_PAGE_KINDS, classify_page, choose_ocr_render
+from services.converters.pdf.merge import merge_pdfs
 
 
-def create_searchable_pdf(pdf_path: Path, lang: str = "rus+eng") -> Path | None:
+# overlay — невидимый текст поверх исходных страниц (размер почти как у входа),
+# raster — страница заменяется растром + текстовый слой (старое поведение)
+SEARCHABLE_OVERLAY = "overlay"
+SEARCHABLE_RASTER = "raster"
+
+# Сколько готовых страниц держим в памяти до сброса на диск (оба режима)
+SEARCHABLE_SPOOL_PAGES = 20
+
+
+def _overlay_page(page: fitz.Page, lang: str) -> None:
+    """Распознаёт страницу и вписывает текстовый слой прямо в неё."""
+    dpi, _ = choose_ocr_render(page)
+    result = ocr_page(page, lang=lang, dpi=dpi)
+    insert_text_layer(page, result["words"], scale=72 / dpi, matrix=overlay_text_matrix(page))
+
+
+def _raster_page(out_doc: fitz.Document, page: fitz.Page, lang: str) -> None:
+    """Добавляет в out_doc растр страницы с текстовым слоем."""
+    dpi, gray = choose_ocr_render(page)
+    pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY if gray else fitz.csRGB)
+    result = ocr_page(page, lang=lang, dpi=dpi, pix=pix)
+
+    out_page = out_doc.new_page(width=page.rect.width, height=page.rect.height)
+    out_page.insert_image(out_page.rect, pixmap=pix)
+    insert_text_layer(out_page, result["words"], scale=72 / dpi)
+
+
+def _save_overlay_pdf(
+    pdf_path: Path,
+    scan_numbers: list[int],
+    lang: str,
+    out_path: Path,
+) -> None:
+    """
+    Собирает overlay-вариант потоково: out_path — копия исходника,
+    растровые страницы распознаются по SEARCHABLE_SPOOL_PAGES за раз,
+    каждый кусок дописывается в файл incremental update (со сжатием),
+    и документ открывается заново — изменённые страницы не копятся в памяти.
+    В конце одна полная перезапись без мусора: старые словари страниц
+    и копии шрифта слоя из каждого куска в итог не попадают.
+    """
+    shutil.copyfile(pdf_path, out_path)
+    for start in range(0, len(scan_numbers), SEARCHABLE_SPOOL_PAGES):
+        with fitz.open(str(out_path)) as out_doc:
+            for number in scan_numbers[start:start + SEARCHABLE_SPOOL_PAGES]:
+                _overlay_page(out_doc[number], lang)
+
+            if out_doc.can_save_incrementally():
+                out_doc.save(
+                    str(out_path),
+                    incremental=True,
+                    encryption=fitz.PDF_ENCRYPT_KEEP,
+                    deflate=True,
+                )
+            else:
+                # битый xref (файл чинился при открытии) — только полная запись
+                _rewrite_pdf(out_doc, out_path)
+
+    with fitz.open(str(out_path)) as out_doc:
+        _rewrite_pdf(out_doc, out_path)
+
+
+def _rewrite_pdf(pdf_doc: fitz.Document, path: Path) -> None:
+    """Полная перезапись открытого pdf_doc поверх path (через временный файл)."""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    # garbage=4: одинаковые потоки (шрифт слоя из разных кусков) — один объект
+    pdf_doc.save(str(tmp_path), garbage=4, deflate=True)
+    # открытый pdf_doc продолжает читать старый файл, замена безопасна
+    tmp_path.replace(path)
+
+
+def _save_raster_pdf(
+    pdf_doc: fitz.Document,
+    kinds: list[str],
+    lang: str,
+    out_path: Path,
+) -> None:
+    """
+    Собирает raster-вариант потоково: каждые SEARCHABLE_SPOOL_PAGES страниц
+    уходят в отдельный PDF на диске и освобождаются. Подряд идущие страницы
+    с текстом копируются одним куском. Итоговый файл собирает merge_pdfs
+    (pikepdf): потоки страниц копируются из кусков при записи, общие для
+    кусков шрифты пишутся один раз — память не растёт с числом страниц.
+    """
+    with tempfile.TemporaryDirectory(dir=TMP_DIR) as spool_dir:
+        chunk_paths: list[Path] = []
+        for start in range(0, len(pdf_doc), SEARCHABLE_SPOOL_PAGES):
+            stop = min(start + SEARCHABLE_SPOOL_PAGES, len(pdf_doc))
+            chunk_doc = fitz.open()
+            for needs_ocr, group in groupby(range(start, stop), key=lambda n: kinds[n] in OCR_PAGE_KINDS):
+                numbers = list(group)
+                if needs_ocr:
+                    for number in numbers:
+                        _raster_page(chunk_doc, pdf_doc[number], lang)
+                else:
+                    # final=False: шрифты, общие для кусков страниц, копируются один раз
+                    chunk_doc.insert_pdf(pdf_doc, from_page=numbers[0], to_page=numbers[-1], final=False)
+
+            chunk_path = Path(spool_dir) / f"chunk_{len(chunk_paths):05d}.pdf"
+            chunk_doc.save(str(chunk_path), garbage=3, deflate=True)
+            chunk_doc.close()
+            chunk_paths.append(chunk_path)
+
+        if merge_pdfs(chunk_paths, out_path) is None:
+            raise RuntimeError("raster chunks assembly failed")
+
+
+def create_searchable_pdf(
+    pdf_path: Path,
+    lang: str | None = None,
+    mode: str = SEARCHABLE_OVERLAY,
+) -> Path | None:
     """
     Создаёт searchable PDF из сканированного PDF.
+    Растровые страницы получают невидимый текстовый слой по рамкам слов OCR:
+      - SEARCHABLE_OVERLAY — слой вписывается в исходную страницу, векторный
+        текст и сжатие картинок сохраняются;
+      - SEARCHABLE_RASTER — страница заменяется рендером + слой.
+    Страницы, где текст уже есть, и пустые страницы копируются как есть, без OCR.
+    lang=None — языки подбираются автоматически (detect_ocr_lang).
     Возвращает путь к новому PDF или None при ошибке.
     """
     try:
@@ -20,28 +144,22 @@ def create_searchable_pdf(pdf_path: Path, lang: str = "rus+eng") -> Path | None:
         logger.error(f"Searchable PDF open error: {e}")
         return None
 
-    merger = PdfMerger()
+    out_path = FILES_DIR / f"{pdf_path.stem}_searchable.pdf"
     try:
-        for page_index, page in enumerate(pdf_doc, start=1):
-            pix = page.get_pixmap(dpi=300)
-            img_bytes = pix.tobytes("png")
-            img = Image.open(BytesIO(img_bytes))
-
-            pdf_bytes = pytesseract.image_to_pdf_or_hocr(
-                img,
-                extension="pdf",
-                lang=lang,
-            )
-
-            merger.append(PdfReader(BytesIO(pdf_bytes)))
-
-        out_path = FILES_DIR / f"{pdf_path.stem}_searchable.pdf"
-        with open(out_path, "wb") as f:
-            merger.write(f)
-        merger.close()
-        pdf_doc.close()
+        kinds = [classify_page(page)[0] for page in pdf_doc]
+        scan_numbers = [i for i, kind in enumerate(kinds) if kind in OCR_PAGE_KINDS]
+        if lang is None:
+            lang = detect_ocr_lang(pdf_doc, scan_numbers)
+
+        if mode == SEARCHABLE_RASTER:
+            _save_raster_pdf(pdf_doc, kinds, lang, out_path)
+        else:
+            _save_overlay_pdf(pdf_path, scan_numbers, lang, out_path)
     except Exception as e:
         logger.error(f"Searchable PDF error: {e}")
         return None
+    finally:
+        pdf_doc.close()
 
-    return out_path if out_path.exists() else None
\ No newline at end of file
+    logger.info(f"Searchable PDF: mode={mode}, lang={lang}, pages={len(kinds)}")
+    return out_path if out_path.exists() else None
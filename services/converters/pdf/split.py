@@ -1,41 +1,275 @@
+import io
+import zipfile
 from pathlib import Path
+from typing import Iterator
 
-from PyPDF2 import PdfReader, PdfWriter
+import pikepdf
 
 from settings import FILES_DIR, logger
+from services.converters.pdf.pages import parse_page_range
 
 
-def split_pdf_to_pages(pdf_path: Path) -> list[Path] | None:
+# Сколько частей отдаём отдельными файлами; больше — одним ZIP
+SPLIT_MAX_FILES = 10
+
+# Оценка размера части: накладные расходы на файл (заголовок, xref, каталог)
+# и на каждую страницу (словарь страницы, запись в дереве страниц)
+PART_OVERHEAD_BYTES = 1024
+PAGE_OVERHEAD_BYTES = 256
+
+# Ссылки, по которым не идём при подсчёте объектов страницы:
+# родитель в дереве страниц и переходы на другие страницы
+_SKIP_KEYS = {"/Parent", "/P", "/Dest", "/A", "/B", "/Thread"}
+
+
+def groups_every_n(total: int, n: int) -> list[list[int]]:
+    """Части по n страниц: [[1..n], [n+1..2n], ...] (номера с 1)."""
+    return [list(range(start, min(start + n, total + 1))) for start in range(1, total + 1, n)]
+
+
+def groups_from_ranges(spec: str, total: int) -> list[list[int]]:
+    """
+    '1-10;11-30' → [[1..10], [11..30]]: группы через ';', внутри —
+    диапазоны как в parse_page_range. Пустые группы отбрасываются.
+    """
+    groups = []
+    for part in spec.split(";"):
+        pages = parse_page_range(part, total)
+        if pages:
+            groups.append(pages)
+    return groups
+
+
+def _object_size(obj) -> int:
+    """Примерный размер объекта в файле: словарь + данные потока по /Length."""
+    if isinstance(obj, pikepdf.Stream):
+        return int(obj.stream_dict.get("/Length", 0)) + len(obj.stream_dict.unparse())
+    return len(obj.unparse())
+
+
+def _collect_objects(obj, sizes: dict) -> None:
+    """
+    Косвенные объекты, достижимые из obj: objgen -> размер (_object_size).
+    Общие объекты (шрифты, картинки) попадают в sizes один раз.
+    """
+    if not isinstance(obj, (pikepdf.Dictionary, pikepdf.Stream, pikepdf.Array)):
+        return
+
+    if obj.is_indirect:
+        if obj.objgen in sizes:
+            return
+        sizes[obj.objgen] = _object_size(obj)
+
+    if isinstance(obj, pikepdf.Array):
+        children = list(obj)
+    else:
+        items = obj.stream_dict.items() if isinstance(obj, pikepdf.Stream) else obj.items()
+        children = [value for name, value in items if name not in _SKIP_KEYS]
+
+    for child in children:
+        _collect_objects(child, sizes)
+
+
+def groups_by_size(pdf_path: Path, max_bytes: int) -> list[list[int]] | None:
+    """
+    Делит документ на подряд идущие части, каждая — примерно не больше max_bytes.
+    Размер оценивается по объектам, на которые ссылаются страницы (без пробной
+    записи): шрифты и картинки, общие для страниц части, учитываются один раз.
+    Страница, которая сама больше лимита, становится отдельной частью.
+    None — если файл не открылся.
+    """
+    try:
+        pdf = pikepdf.open(pdf_path)
+    except Exception as e:
+        logger.error(f"Split PDF open error: {e}")
+        return None
+
+    with pdf:
+        groups: list[list[int]] = []
+        part_objects: dict = {}
+        part_size = PART_OVERHEAD_BYTES
+
+        for number, page in enumerate(pdf.pages, start=1):
+            page_sizes: dict = {}
+            _collect_objects(page.obj, page_sizes)
+            added = sum(size for key, size in page_sizes.items() if key not in part_objects)
+            added += PAGE_OVERHEAD_BYTES
+
+            if groups and part_size + added > max_bytes:
+                groups.append([])
+                part_objects = {}
+                part_size = PART_OVERHEAD_BYTES
+                added = sum(page_sizes.values()) + PAGE_OVERHEAD_BYTES
+            elif not groups:
+                groups.append([])
+
+            groups[-1].append(number)
+            part_objects.update(page_sizes)
+            part_size += added
+
+    return groups
+
+
+def split_page_count(pdf_path: Path) -> int | None:
+    """Число страниц тем же разбором (pikepdf), что и само разделение. None — не открылся."""
+    try:
+        with pikepdf.open(pdf_path) as src:
+            return len(src.pages)
+    except Exception as e:
+        logger.error(f"Split PDF open error: {e}")
+        return None
+
+
+def _part_name(base: str, group: list[int]) -> str:
+    if len(group) == 1:
+        return f"{base}_page_{group[0]}.pdf"
+    return f"{base}_pages_{group[0]}-{group[-1]}.pdf"
+
+
+def _write_part(
+    src: pikepdf.Pdf,
+    pages: list[int],
+    stream,
+    rotations: dict[int, int] | None = None,
+) -> None:
+    """
+    Пишет страницы src (номера с 1) отдельным PDF в stream.
+    Копируются только объекты, на которые ссылаются сами страницы; из общих
+    словарей /Resources выкидываются шрифты и картинки, которые эти страницы
+    не используют, — часть не тащит ресурсы всего документа.
+    Общие для страниц части объекты копируются один раз.
+    rotations — номер страницы src -> дополнительный поворот по часовой (кратный 90).
+    """
+    rotations = rotations or {}
+    with pikepdf.Pdf.new() as dst:
+        for number in pages:
+            dst.pages.append(src.pages[number - 1])
+            if rotations.get(number):
+                dst.pages[-1].rotate(rotations[number], relative=True)
+        dst.remove_unreferenced_resources()
+        dst.save(
+            stream,
+            compress_streams=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+        )
+
+
+def _iter_part_pdfs(
+    src: pikepdf.Pdf,
+    base: str,
+    groups: list[list[int]],
+) -> Iterator[tuple[str, bytes]]:
+    """По одной части: (имя файла, байты PDF). В памяти только текущая часть."""
+    for group in groups:
+        buf = io.BytesIO()
+        _write_part(src, group, buf)
+        yield _part_name(base, group), buf.getvalue()
+
+
+def extract_pages(
+    pdf_path: Path,
+    pages: list[int],
+    out_path: Path,
+    rotations: dict[int, int] | None = None,
+) -> Path | None:
+    """
+    Сохраняет страницы pages (номера с 1, в этом порядке) в out_path,
+    rotations — дополнительные повороты страниц (см. _write_part).
+    Ресурсы — только используемые этими страницами.
+    Возвращает out_path или None при ошибке.
+    """
+    try:
+        with pikepdf.open(pdf_path) as src:
+            with open(out_path, "wb") as f:
+                _write_part(src, pages, f, rotations)
+    except Exception as e:
+        logger.error(f"Extract pages error: {e}")
+        return None
+    return out_path
+
+
+def split_pdf_to_pages(pdf_path: Path, groups: list[list[int]] | None = None) -> list[Path] | None:
     """
-    Делит PDF на отдельные страницы.
+    Делит PDF на части (groups — номера страниц с 1; None — по одной странице).
     Возвращает:
       - None — если не удалось открыть файл,
       - []   — если в документе 1 страница,
-      - список путей к созданным PDF-страницам.
+      - список путей к созданным PDF.
     """
     try:
-        reader = PdfReader(str(pdf_path))
+        src = pikepdf.open(pdf_path)
     except Exception as e:
         logger.error(f"Split PDF open error: {e}")
         return None
 
-    n = len(reader.pages)
-    if n <= 1:
-        return []
+    parts_paths: list[Path] = []
+    with src:
+        total = len(src.pages)
+        if total <= 1:
+            return []
+
+        try:
+            for name, data in _iter_part_pdfs(src, pdf_path.stem, groups or groups_every_n(total, 1)):
+                out_path = FILES_DIR / name
+                out_path.write_bytes(data)
+                parts_paths.append(out_path)
+        except Exception as e:
+            logger.error(f"Split PDF write error: {e}")
+            return None
+
+    return parts_paths
 
-    pages_paths: list[Path] = []
-    base = pdf_path.stem
 
+def split_pdf_to_zip(
+    pdf_path: Path,
+    zip_path: Path,
+    groups: list[list[int]] | None = None,
+) -> int | None:
+    """
+    Делит PDF на части и пишет их сразу в ZIP (без сжатия: PDF-потоки
+    уже сжаты, а ZIP_STORED — это один проход записи без работы CPU).
+    Промежуточных файлов нет. Возвращает число частей или None при ошибке.
+    """
     try:
-        for i in range(n):
-            writer = PdfWriter()
-            writer.add_page(reader.pages[i])
-            out_path = FILES_DIR / f"{base}_page_{i + 1}.pdf"
-            with open(out_path, "wb") as f:
-                writer.write(f)
-            pages_paths.append(out_path)
+        src = pikepdf.open(pdf_path)
     except Exception as e:
-        logger.error(f"Split PDF write error: {e}")
+        logger.error(f"Split PDF open error: {e}")
         return None
 
-    return pages_paths
+    with src:
+        groups = groups or groups_every_n(len(src.pages), 1)
+        try:
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zf:
+                for name, data in _iter_part_pdfs(src, pdf_path.stem, groups):
+                    zf.writestr(name, data)
+        except Exception as e:
+            logger.error(f"Split PDF zip error: {e}")
+            return None
+
+    return len(groups)
+
+
+def split_pdf(pdf_path: Path, groups: list[list[int]] | None = None) -> dict | None:
+    """
+    Разделение для выдачи пользователю (groups=None — по одной странице):
+      - {"count": n, "files": [пути]} — если частей не больше SPLIT_MAX_FILES
+        (для одностраничного PDF без groups files пустой),
+      - {"count": n, "zip": путь} — иначе, все части в одном ZIP.
+    None — если файл не открылся или не записался.
+    """
+    if groups is None:
+        try:
+            with pikepdf.open(pdf_path) as src:
+                groups = groups_every_n(len(src.pages), 1)
+        except Exception as e:
+            logger.error(f"Split PDF open error: {e}")
+            return None
+
+    if len(groups) <= SPLIT_MAX_FILES:
+        files = split_pdf_to_pages(pdf_path, groups)
+        return None if files is None else {"count": len(groups), "files": files}
+
+    zip_path = FILES_DIR / f"{pdf_path.stem}_pages.zip"
+    if split_pdf_to_zip(pdf_path, zip_path, groups) is None:
+        return None
+    return {"count": len(groups), "zip": zip_path}
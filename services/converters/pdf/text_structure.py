@@ -0,0 +1,257 @@
+import fitz
+
+
+# Заголовки Markdown: во сколько раз строка крупнее основного текста страницы
+HEADING_SCALES = ((1.6, "#"), (1.3, "##"), (1.15, "###"))
+HEADING_MAX_CHARS = 200
+
+# Раскладка: пустая строка между строками текста, если зазор больше доли высоты строки
+LAYOUT_GAP_LINES = 1.5
+
+# Слова OCR: разрыв строки по горизонтали и граница блока по вертикали (в высотах строки)
+OCR_WORD_GAP_LINES = 3.0
+OCR_BLOCK_GAP_LINES = 1.0
+
+
+def _round_bbox(bbox) -> list[float]:
+    return [round(v, 2) for v in bbox]
+
+
+def _line_words(line: dict) -> list[dict]:
+    """Слова строки из символов rawdict: граница слова — пробельный символ."""
+    words: list[dict] = []
+    chars: list[dict] = []
+
+    def flush():
+        if chars:
+            rect = fitz.Rect(chars[0]["bbox"])
+            for ch in chars[1:]:
+                rect |= ch["bbox"]
+            words.append({"bbox": _round_bbox(rect), "text": "".join(ch["c"] for ch in chars)})
+            chars.clear()
+
+    for span in line["spans"]:
+        for ch in span["chars"]:
+            if ch["c"].isspace():
+                flush()
+            else:
+                chars.append(ch)
+    flush()
+    return words
+
+
+def page_structure(page: fitz.Page) -> dict:
+    """
+    Структура текста страницы за один разбор (rawdict):
+    {"number", "width", "height", "blocks": [{"bbox", "lines": [
+        {"bbox", "text", "size", "words": [{"bbox", "text"}]}]}]}
+    Координаты — в пунктах, от левого верхнего угла видимой страницы.
+    """
+    raw = page.get_text("rawdict", flags=fitz.TEXTFLAGS_TEXT)
+
+    blocks = []
+    for block in raw["blocks"]:
+        if block["type"] != 0:
+            continue
+
+        lines = []
+        for line in block["lines"]:
+            words = _line_words(line)
+            if not words:
+                continue
+            lines.append({
+                "bbox": _round_bbox(line["bbox"]),
+                "text": " ".join(w["text"] for w in words),
+                "size": round(max(span["size"] for span in line["spans"]), 1),
+                "words": words,
+            })
+
+        if lines:
+            blocks.append({"bbox": _round_bbox(block["bbox"]), "lines": lines})
+
+    return {
+        "number": page.number + 1,
+        "width": round(page.rect.width, 2),
+        "height": round(page.rect.height, 2),
+        "blocks": blocks,
+    }
+
+
+def _ocr_line(words: list[tuple[fitz.Rect, str]]) -> dict:
+    rect = fitz.Rect(words[0][0])
+    for word_rect, _ in words[1:]:
+        rect |= word_rect
+    return {
+        "bbox": _round_bbox(rect),
+        "text": " ".join(text for _, text in words),
+        "size": round(rect.height, 1),
+        "words": [{"bbox": _round_bbox(r), "text": text} for r, text in words],
+    }
+
+
+def ocr_structure(page: fitz.Page, words: list, scale: float) -> dict:
+    """
+    Та же структура, что у page_structure, но из слов OCR
+    [(x0, y0, x1, y1, word), ...] в пикселях рендера; scale = 72 / dpi.
+    Строки — слова с пересекающейся высотой (большой зазор по x рвёт строку),
+    блоки — строки без заметного вертикального зазора. size — высота строки.
+    """
+    items = sorted(
+        ((fitz.Rect(x0, y0, x1, y1) * scale, word) for x0, y0, x1, y1, word in words),
+        key=lambda item: ((item[0].y0 + item[0].y1) / 2, item[0].x0),
+    )
+
+    rows: list[list[tuple[fitz.Rect, str]]] = []
+    for rect, word in items:
+        center = (rect.y0 + rect.y1) / 2
+        if rows and rows[-1][0][0].y0 <= center <= rows[-1][0][0].y1:
+            rows[-1].append((rect, word))
+        else:
+            rows.append([(rect, word)])
+
+    lines: list[dict] = []
+    for row in rows:
+        row.sort(key=lambda item: item[0].x0)
+        current = [row[0]]
+        for rect, word in row[1:]:
+            if rect.x0 - current[-1][0].x1 > OCR_WORD_GAP_LINES * rect.height:
+                lines.append(_ocr_line(current))
+                current = []
+            current.append((rect, word))
+        lines.append(_ocr_line(current))
+
+    blocks: list[dict] = []
+    for line in sorted(lines, key=lambda item: (item["bbox"][1], item["bbox"][0])):
+        if blocks:
+            last = blocks[-1]["lines"][-1]["bbox"]
+            height = last[3] - last[1]
+            same_column = line["bbox"][0] < last[2] and line["bbox"][2] > last[0]
+            if same_column and line["bbox"][1] - last[3] < OCR_BLOCK_GAP_LINES * height:
+                blocks[-1]["lines"].append(line)
+                continue
+        blocks.append({"lines": [line]})
+
+    for block in blocks:
+        rect = fitz.Rect(block["lines"][0]["bbox"])
+        for line in block["lines"][1:]:
+            rect |= line["bbox"]
+        block["bbox"] = _round_bbox(rect)
+
+    return {
+        "number": page.number + 1,
+        "width": round(page.rect.width, 2),
+        "height": round(page.rect.height, 2),
+        "blocks": [{"bbox": b["bbox"], "lines": b["lines"]} for b in blocks],
+    }
+
+
+def layout_text(structure: dict) -> str:
+    """
+    Текст с сохранением раскладки: строки, стоящие на одной высоте,
+    собираются в одну строку, слова ставятся в колонку по своей x-координате.
+    Соседние слова одной фразы разделяются одним пробелом, общий левый
+    отступ страницы убирается.
+    """
+    lines = [line for block in structure["blocks"] for line in block["lines"]]
+    if not lines:
+        return ""
+
+    # ширина символа сетки — медианная ширина символа на странице
+    widths = sorted(
+        (w["bbox"][2] - w["bbox"][0]) / len(w["text"])
+        for line in lines
+        for w in line["words"]
+    )
+    char_w = max(widths[len(widths) // 2], 1.0)
+    left = min(line["bbox"][0] for line in lines)
+
+    rows: list[list[dict]] = []
+    for line in sorted(lines, key=lambda item: (item["bbox"][1], item["bbox"][0])):
+        y0, y1 = line["bbox"][1], line["bbox"][3]
+        if rows:
+            last = rows[-1][0]["bbox"]
+            if (y0 + y1) / 2 < last[3] and (y0 + y1) / 2 > last[1]:
+                rows[-1].append(line)
+                continue
+        rows.append([line])
+
+    out: list[str] = []
+    prev_bottom = None
+    for row in rows:
+        top = min(line["bbox"][1] for line in row)
+        height = max(line["bbox"][3] - line["bbox"][1] for line in row)
+        if prev_bottom is not None and height and (top - prev_bottom) > LAYOUT_GAP_LINES * height:
+            out.append("")
+        prev_bottom = max(line["bbox"][3] for line in row)
+
+        text = ""
+        prev = None
+        words = sorted((w for line in row for w in line["words"]), key=lambda w: w["bbox"][0])
+        for w in words:
+            col = int((w["bbox"][0] - left) / char_w)
+            if prev is not None:
+                # зазор меньше двух «своих» символов — то же предложение
+                own_w = (prev["bbox"][2] - prev["bbox"][0]) / len(prev["text"])
+                if w["bbox"][0] - prev["bbox"][2] < 2 * own_w:
+                    col = len(text) + 1
+                col = max(col, len(text) + 1)
+            text = text.ljust(col) + w["text"]
+            prev = w
+        out.append(text)
+
+    return "\n".join(out)
+
+
+def _body_size(structure: dict) -> float:
+    """Кегль основного текста: самый частый по числу символов."""
+    weights: dict[float, int] = {}
+    for block in structure["blocks"]:
+        for line in block["lines"]:
+            weights[line["size"]] = weights.get(line["size"], 0) + len(line["text"])
+    return max(weights, key=weights.get) if weights else 0.0
+
+
+def _heading_prefix(block: dict, body: float) -> str | None:
+    """Префикс заголовка Markdown для блока или None, если это обычный текст."""
+    text_len = sum(len(line["text"]) for line in block["lines"])
+    if not body or text_len > HEADING_MAX_CHARS:
+        return None
+
+    size = min(line["size"] for line in block["lines"])
+    for scale, prefix in HEADING_SCALES:
+        if size >= body * scale:
+            return prefix
+    return None
+
+
+def markdown_text(page: fitz.Page | None, structure: dict) -> str:
+    """
+    Markdown страницы: заголовки по кеглю относительно основного текста,
+    таблицы (page.find_tables) — таблицами Markdown, остальное — абзацами.
+    page=None — без поиска таблиц (например, для текста из OCR).
+    """
+    items: list[tuple[float, str]] = []
+
+    table_rects = []
+    try:
+        for table in page.find_tables().tables if page is not None else ():
+            table_rects.append(fitz.Rect(table.bbox))
+            items.append((table.bbox[1], table.to_markdown().strip()))
+    except Exception:
+        # поиск таблиц — только улучшение, текст страницы важнее
+        table_rects = []
+        items = []
+
+    body = _body_size(structure)
+    for block in structure["blocks"]:
+        rect = fitz.Rect(block["bbox"])
+        center = (rect.tl + rect.br) / 2
+        if any(center in table_rect for table_rect in table_rects):
+            continue
+
+        text = " ".join(line["text"] for line in block["lines"])
+        prefix = _heading_prefix(block, body)
+        items.append((rect.y0, f"{prefix} {text}" if prefix else text))
+
+    items.sort(key=lambda item: item[0])
+    return "\n\n".join(text for _, text in items)
@@ -36,6 +36,48 @@ FREE_MAX_SIZE = 20 * 1024 * 1024  # 20 MB
 PRO_MAX_SIZE = 20 * 1024 * 1024   # 20 MB (ограничение Telegram)
 
 
+# ========== OCR ==========
+# Каталог с *.traineddata для tesseract (C API через tesserocr)
+TESSDATA_DIR = os.getenv("TESSDATA_PREFIX", "/usr/share/tesseract-ocr/5/tessdata")
+
+# Установленные языковые модели tesseract (через "+", как в -l).
+# Для каждого документа OCR выбирает из них минимальный набор по скрипту.
+OCR_LANGUAGES = [
+    lang for lang in os.getenv("OCR_LANGUAGES", "eng+rus").split("+") if lang
+]
+
+# Постраничный кэш результатов OCR (на диске, вытеснение LRU)
+OCR_CACHE_DIR = TMP_DIR / "ocr_cache"
+OCR_CACHE_MAX_BYTES = int(os.getenv("OCR_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+OCR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+
+# ========== TEXT EXTRACTION ==========
+# Процессы для параллельного извлечения текста из больших PDF
+TEXT_EXTRACT_WORKERS = int(
+    os.getenv("TEXT_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+
+
+# ========== MERGE ==========
+# Сессии объединения: присланные файлы копятся на диске до сборки итога
+MERGE_DIR = TMP_DIR / "merge"
+MERGE_DIR.mkdir(parents=True, exist_ok=True)
+
+# Сколько файлов можно собрать в одно объединение
+MERGE_MAX_FILES_FREE = int(os.getenv("MERGE_MAX_FILES_FREE", "10"))
+MERGE_MAX_FILES_PRO = int(os.getenv("MERGE_MAX_FILES_PRO", "100"))
+
+
+# ========== PAGE EDITOR ==========
+# Открытые документы сессий редактора страниц (кэш LRU в памяти процесса)
+EDITOR_CACHE_MAX_BYTES = int(os.getenv("EDITOR_CACHE_MAX_MB", "256")) * 1024 * 1024
+EDITOR_CACHE_IDLE_SECONDS = int(os.getenv("EDITOR_CACHE_IDLE_SECONDS", "600"))
+# Как часто фоновая задача закрывает простаивающие документы
+EDITOR_CACHE_SWEEP_SECONDS = int(os.getenv("EDITOR_CACHE_SWEEP_SECONDS", "60"))
+
+
 def format_mb(size_bytes: int) -> str:
     mb = size_bytes / (1024 * 1024)
     return f"{int(mb)} MB"
@@ -78,6 +120,13 @@ async def get_user_limit(user_id: int) -> int:
     return FREE_MAX_SIZE
 
 
+async def get_merge_limit(user_id: int) -> int:
+    """Сколько файлов пользователь может объединить за раз (по тарифу)."""
+    if await is_pro(user_id):
+        return MERGE_MAX_FILES_PRO
+    return MERGE_MAX_FILES_FREE
+
+
 async def get_pro_expire_ts(user_id: int) -> int | None:
     """
     Возвращает timestamp (int, seconds) окончания PRO
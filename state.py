@@ -1,20 +1,24 @@
 # state.py
-from pathlib import Path
-from typing import Dict, List
+from typing import Dict
 
 import json
 import os
 
 # mode:
-#   compress, pdf_text, doc_photo, merge, split, ocr, searchable_pdf,
+#   compress, pdf_text, doc_photo, merge, ocr, searchable_pdf,
+#   split, split_menu, split_wait_every, split_wait_size, split_wait_ranges,
 #   watermark, watermark_wait_text, watermark_wait_style,
 #   pages_wait_pdf, pages_menu,
 #   pages_rotate_wait_pages, pages_rotate_wait_angle,
-#   pages_delete_wait_pages, pages_extract_wait_pages
+#   pages_delete_wait_pages, pages_extract_wait_pages, pages_reorder_wait_order
 user_modes: Dict[int, str] = {}
 
-# список PDF-файлов для объединения
-user_merge_files: Dict[int, List[Path]] = {}
+# сессии объединения (файлы копятся в папке сессии, см. handlers/merge.py):
+# user_id -> {"dir": Path, "output": dict,
+#             "files": [{"path", "name", "pages", "out_pages", "outline"}],
+#             "queued": int, "received": int,
+#             "tail": asyncio.Task | None, "closed": bool}
+user_merge_sessions: Dict[int, dict] = {}
 
 # состояние для водяных знаков:
 # user_id -> {"pdf_path": Path, "text": str, "pos": "11", "mosaic": bool}
@@ -24,6 +28,14 @@ user_watermark_state: Dict[int, dict] = {}
 # user_id -> {"pdf_path": Path, "pages": int, ... }
 user_pages_state: Dict[int, dict] = {}
 
+# состояние для разделения PDF:
+# user_id -> {"pdf_path": Path, "pages": int}
+user_split_state: Dict[int, dict] = {}
+
+# пустые страницы, найденные при OCR (предложение удалить их):
+# user_id -> {"pdf_path": Path, "pages": [номера с 1]}
+user_blank_pages_state: Dict[int, dict] = {}
+
 # Если у тебя здесь были переменные/логика, связанные с billing API
 # (BILLING_BASE_URL, is_pro_user и т.п.) — их нужно удалить,
 # потому что теперь единственный источник правды по подписке — PostgreSQL
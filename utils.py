@@ -1,4 +1,5 @@
 # utils.py
+from pathlib import Path
 from typing import Optional
 
 from aiogram import types
@@ -6,6 +7,10 @@ from aiogram import types
 from settings import get_user_limit, is_pro, format_mb, logger
 
 
+# Telegram: не больше 10 файлов в одной медиагруппе
+MEDIA_GROUP_MAX = 10
+
+
 async def check_size_or_reject(
     message: types.Message,
     size_bytes: Optional[int],
@@ -67,4 +72,31 @@ async def ensure_pro(message: types.Message) -> bool:
         )
         return False
 
-    return True
\ No newline at end of file
+    return True
+
+
+async def send_documents(
+    message: types.Message,
+    files: list[tuple[Path, Optional[str]]],
+) -> None:
+    """
+    Отправляет несколько файлов [(путь, подпись), ...] медиагруппами
+    по MEDIA_GROUP_MAX штук: один sendMediaGroup вместо запроса на каждый
+    файл, все файлы группы загружаются одним запросом.
+    Группы идут по очереди, чтобы порядок файлов в чате сохранялся.
+    Одиночный файл уходит обычным answer_document.
+    """
+    for start in range(0, len(files), MEDIA_GROUP_MAX):
+        batch = files[start:start + MEDIA_GROUP_MAX]
+
+        if len(batch) == 1:
+            path, caption = batch[0]
+            await message.answer_document(types.FSInputFile(path), caption=caption)
+            continue
+
+        await message.answer_media_group(
+            [
+                types.InputMediaDocument(media=types.FSInputFile(path), caption=caption)
+                for path, caption in batch
+            ]
+        )